@@ -3,20 +3,22 @@ from chess import standard as std, three_check as tc, no_castling as nc, torpedo
     crazyhouse as ch
 
 
-class Standard(std.Board): pass
-class ThreeCheck(tc.Board): pass
-class NoCastling(nc.Board): pass
-class Torpedo(tp.Board): pass
-class AntiChess(ac.Board): pass
-class KingOfTheHill(koth.Board): pass
-class RacingKings(rk.Board): pass
-class Horde(hd.Board): pass
-class FromPosition(std.Board):pass
-class CrazyHouse(ch.Board):pass
+class Standard(std.Board): __slots__ = ()
+class ThreeCheck(tc.Board): __slots__ = ()
+class NoCastling(nc.Board): __slots__ = ()
+class Torpedo(tp.Board): __slots__ = ()
+class AntiChess(ac.Board): __slots__ = ()
+class KingOfTheHill(koth.Board): __slots__ = ()
+class RacingKings(rk.Board): __slots__ = ()
+class Horde(hd.Board): __slots__ = ()
+class FromPosition(std.Board): __slots__ = ()
+class CrazyHouse(ch.Board): __slots__ = ()
 
 
 class Chess960(std.Board):
+    __slots__ = ()
+
     def __init__(self, fen:str="", format_:str="5+0") -> None:
         if not fen:
-            fen = std.generate_chess960_pieces() + " w - - 0 1"
+            fen = std.generate_chess960_pieces() + " w KQkq - 0 1"
         super().__init__(fen, format_)
@@ -0,0 +1,232 @@
+"""Contains the bitboard helpers the boards are built on
+
+A bitboard is a 64 bit integer with one bit per square, a1 being bit 0, b1 bit 1
+and h8 bit 63. Squares are indexed the same way (rank * 8 + file).
+"""
+
+from typing import Iterator
+
+
+SQUARE_NAMES = [file + rank for rank in "12345678" for file in "abcdefgh"]
+SQUARES = {name: index for index, name in enumerate(SQUARE_NAMES)}
+
+BB_EMPTY = 0
+BB_ALL = (1 << 64) - 1
+BB_SQUARES = [1 << square for square in range(64)]
+BB_FILES = [0x0101010101010101 << file for file in range(8)]
+BB_RANKS = [0xff << (8 * rank) for rank in range(8)]
+
+ROOK_DELTAS = (8, -8, 1, -1)
+BISHOP_DELTAS = (9, 7, -7, -9)
+KNIGHT_DELTAS = (17, 15, 10, 6, -6, -10, -15, -17)
+KING_DELTAS = (9, 8, 7, 1, -1, -7, -8, -9)
+
+
+def square(name:str) -> int:
+    """Returns the index of the square with the given name ("e4" -> 28)"""
+    return SQUARES[name[:2]]
+
+
+def square_name(square:int) -> str:
+    """Returns the name of the square with the given index (28 -> "e4")"""
+    return SQUARE_NAMES[square]
+
+
+def square_file(square:int) -> int:
+    """Returns the file of the square (0 for the a-file)"""
+    return square & 7
+
+
+def square_rank(square:int) -> int:
+    """Returns the rank of the square (0 for the first rank)"""
+    return square >> 3
+
+
+def square_distance(a:int, b:int) -> int:
+    """Returns the number of king steps between two squares"""
+    return max(abs((a & 7) - (b & 7)), abs((a >> 3) - (b >> 3)))
+
+
+def scan(bb:int) -> Iterator[int]:
+    """Yields the index of every set square, starting from a1
+
+    Args:
+        bb (int): The bitboard
+    """
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
+def popcount(bb:int) -> int:
+    """Returns the number of set squares"""
+    return bb.bit_count()
+
+
+def step_attacks(square:int, deltas:tuple[int, ...]) -> int:
+    """Squares reachable with a single step in any of the given directions
+
+    Args:
+        square (int): The starting square
+        deltas (tuple[int, ...]): Index differences of the steps
+
+    Returns:
+        int: bitboard of the reachable squares
+    """
+    bb = BB_EMPTY
+    for delta in deltas:
+        target = square + delta
+        # A step that wraps around the edge changes the file by more than 2
+        if 0 <= target < 64 and square_distance(square, target) <= 2:
+            bb |= BB_SQUARES[target]
+    return bb
+
+
+def sliding_attacks(square:int, occupied:int, deltas:tuple[int, ...]) -> int:
+    """Squares reachable by sliding in the given directions until the first blocker
+
+    Args:
+        square (int): The starting square
+        occupied (int): bitboard of every occupied square
+        deltas (tuple[int, ...]): Index differences of one step in each direction
+
+    Returns:
+        int: bitboard of the reachable squares, blockers included
+    """
+    bb = BB_EMPTY
+    for delta in deltas:
+        current = square
+        while True:
+            target = current + delta
+            if not 0 <= target < 64 or square_distance(current, target) > 1:
+                break
+            bb |= BB_SQUARES[target]
+            if occupied & BB_SQUARES[target]:
+                break
+            current = target
+    return bb
+
+
+# Squares attacked from every square, built once so that the leapers are a lookup
+BB_KNIGHT_ATTACKS = [step_attacks(square, KNIGHT_DELTAS) for square in range(64)]
+BB_KING_ATTACKS = [step_attacks(square, KING_DELTAS) for square in range(64)]
+# Indexed by color first: BB_PAWN_ATTACKS[1][square] for a black pawn
+BB_PAWN_ATTACKS = [[step_attacks(square, deltas) for square in range(64)]
+                   for deltas in ((7, 9), (-7, -9))]
+
+
+def _edges(square:int) -> int:
+    """Border squares that cannot block a slider standing on the given square"""
+    return (((BB_RANKS[0] | BB_RANKS[7]) & ~BB_RANKS[square_rank(square)])
+            | ((BB_FILES[0] | BB_FILES[7]) & ~BB_FILES[square_file(square)]))
+
+
+def _subsets(mask:int) -> Iterator[int]:
+    """Yields every subset of the bitboard, the empty one included"""
+    subset = BB_EMPTY
+    while True:
+        yield subset
+        subset = (subset - mask) & mask
+        if not subset:
+            break
+
+
+def _line_table(deltas:tuple[int, int]) -> tuple[list[int], list[dict[int, int]]]:
+    """Precomputes the sliding attacks along one line through every square
+
+    Returns:
+        tuple[list[int], list[dict[int, int]]]: the squares on the line that can block
+        a slider on each square, and the attacks for every occupancy of those squares
+    """
+    masks, tables = [], []
+    for square in range(64):
+        mask = sliding_attacks(square, BB_EMPTY, deltas) & ~_edges(square)
+        masks.append(mask)
+        tables.append({subset: sliding_attacks(square, subset, deltas)
+                       for subset in _subsets(mask)})
+    return masks, tables
+
+
+# A slider's attacks along a line only depend on the few squares of that line it
+# could be blocked on, so each line gets a table indexed by that occupancy
+BB_FILE_MASKS, BB_FILE_ATTACKS = _line_table((8, -8))
+BB_RANK_MASKS, BB_RANK_ATTACKS = _line_table((1, -1))
+BB_DIAG_MASKS, BB_DIAG_ATTACKS = _line_table((9, -9))
+BB_ANTI_DIAG_MASKS, BB_ANTI_DIAG_ATTACKS = _line_table((7, -7))
+
+
+def rook_attacks(square:int, occupied:int) -> int:
+    """Squares a rook on the square attacks, given the occupied squares"""
+    return (BB_FILE_ATTACKS[square][occupied & BB_FILE_MASKS[square]]
+            | BB_RANK_ATTACKS[square][occupied & BB_RANK_MASKS[square]])
+
+
+def bishop_attacks(square:int, occupied:int) -> int:
+    """Squares a bishop on the square attacks, given the occupied squares"""
+    return (BB_DIAG_ATTACKS[square][occupied & BB_DIAG_MASKS[square]]
+            | BB_ANTI_DIAG_ATTACKS[square][occupied & BB_ANTI_DIAG_MASKS[square]])
+
+
+def queen_attacks(square:int, occupied:int) -> int:
+    """Squares a queen on the square attacks, given the occupied squares"""
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+def rook_xray_attacks(square:int, occupied:int, blockers:int) -> int:
+    """Squares a rook attacks through the first of the given blockers on each line
+
+    Args:
+        square (int): The square of the rook
+        occupied (int): bitboard of every occupied square
+        blockers (int): bitboard of the pieces to look through
+
+    Returns:
+        int: bitboard of the squares only attacked once the blockers are removed
+    """
+    attacks = rook_attacks(square, occupied)
+    blockers &= attacks
+    return attacks ^ rook_attacks(square, occupied ^ blockers)
+
+
+def bishop_xray_attacks(square:int, occupied:int, blockers:int) -> int:
+    """Squares a bishop attacks through the first of the given blockers on each diagonal
+
+    Args:
+        square (int): The square of the bishop
+        occupied (int): bitboard of every occupied square
+        blockers (int): bitboard of the pieces to look through
+
+    Returns:
+        int: bitboard of the squares only attacked once the blockers are removed
+    """
+    attacks = bishop_attacks(square, occupied)
+    blockers &= attacks
+    return attacks ^ bishop_attacks(square, occupied ^ blockers)
+
+
+def _line(a:int, b:int) -> int:
+    """Whole rank, file or diagonal going through both squares"""
+    for table in (BB_FILE_ATTACKS, BB_RANK_ATTACKS, BB_DIAG_ATTACKS, BB_ANTI_DIAG_ATTACKS):
+        if table[a][BB_EMPTY] & BB_SQUARES[b]:
+            return table[a][BB_EMPTY] | BB_SQUARES[a]
+    return BB_EMPTY
+
+
+def _between(a:int, b:int) -> int:
+    occupied = BB_SQUARES[a] | BB_SQUARES[b]
+    return queen_attacks(a, occupied) & queen_attacks(b, occupied) & _line(a, b)
+
+
+# BB_BETWEEN[a][b] holds the squares strictly in between, empty when the squares are not
+# aligned
+BB_BETWEEN = [[_between(a, b) for b in range(64)] for a in range(64)]
+
+
+def between(a:int, b:int) -> int:
+    """Squares strictly between two squares on the same rank, file or diagonal
+
+    Returns:
+        int: bitboard of the squares in between, empty if the squares are not aligned
+    """
+    return BB_BETWEEN[a][b]
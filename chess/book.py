@@ -0,0 +1,253 @@
+"""Contains the opening book builder, which turns a PGN collection into a Polyglot book
+
+Build a book from the first 20 plies of every game with
+``python -m chess.book games.pgn book.bin --plies 20``. The games are streamed one at a
+time and the moves counted in memory up to a limit, past which the counts are sorted
+and spilled to temporary run files that are merged at the end. Memory stays bounded
+whatever the size of the collection, and the book comes out sorted, ready for
+chess.polyglot.Book to map.
+"""
+
+import heapq
+import os
+import re
+import struct
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from typing import IO, Iterator, NamedTuple
+from chess import standard as std
+from chess.polyglot import ENTRY_STRUCT, encode_move, polyglot_hash
+
+
+# Key, move, games, wins and draws of a counted move, as stored in the run files
+RUN_STRUCT = struct.Struct(">QHIII")
+HEADER_REGEX = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+# Comments, variation brackets, annotations and everything else
+TOKEN_REGEX = re.compile(r"\{[^}]*\}|\(|\)|\$\d+|[^\s(){}]+")
+MOVE_NUMBER_REGEX = re.compile(r"^\d+\.+")
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+# Largest weight a Polyglot entry holds
+MAX_WEIGHT = 0xFFFF
+
+
+class Game(NamedTuple):
+    """A game read from a PGN file
+
+    Args:
+        headers (dict[str, str]): The tag pairs, like "White" or "Result"
+        moves (list[str]): The moves of the main line in SAN
+        result (str): "1-0", "0-1", "1/2-1/2" or "*"
+    """
+    headers:dict[str, str]
+    moves:list[str]
+    result:str
+
+
+def read_games(file:IO[str]) -> Iterator[Game]:
+    """Reads the games of a PGN file one at a time. Comments, variations and
+    annotations are skipped.
+
+    Args:
+        file (IO[str]): The open PGN file
+
+    Yields:
+        Game: Each game of the file
+    """
+    headers:dict[str, str] = {}
+    movetext:list[str] = []
+    for line in file:
+        line = line.strip()
+        if line.startswith("%"):
+            continue
+        if (match := HEADER_REGEX.match(line)):
+            if movetext:
+                yield _parse_game(headers, movetext)
+                headers, movetext = {}, []
+            headers[match.group(1)] = match.group(2)
+        elif line:
+            # Everything after a semicolon outside braces is a comment
+            if ";" in line and "{" not in line:
+                line = line.split(";", 1)[0]
+            movetext.append(line)
+    if headers or movetext:
+        yield _parse_game(headers, movetext)
+
+
+def _parse_game(headers:dict[str, str], movetext:list[str]) -> Game:
+    """Splits the movetext of a game into the moves of the main line"""
+    moves = []
+    result = headers.get("Result", "*")
+    variations = 0
+    for token in TOKEN_REGEX.findall(" ".join(movetext)):
+        if token == "(":
+            variations += 1
+        elif token == ")":
+            variations = max(variations - 1, 0)
+        elif variations or token[0] in "{$":
+            continue
+        elif token in RESULTS:
+            result = token
+        elif (token := MOVE_NUMBER_REGEX.sub("", token)):
+            moves.append(token)
+    return Game(headers, moves, result)
+
+
+def replay(game:Game, plies:int) -> Iterator[tuple[int, int, float|None]]:
+    """Replays the start of a game. Games of other variants or with a broken FEN header
+    are skipped, and a game stops at its first illegal move.
+
+    Args:
+        game (Game): The game
+        plies (int): Number of half moves to replay
+
+    Yields:
+        tuple[int, int, float|None]: The Polyglot key of each position, the Polyglot move
+        played in it and the result for the player who played it: 1 for a win, 0.5 for
+        a draw, 0 for a loss and None if the game was not finished
+    """
+    if game.headers.get("Variant", "Standard").lower() not in ("standard", "chess"):
+        return
+    board = std.Board()
+    if (fen := game.headers.get("FEN")):
+        # Set up on a board made from the start position, whose constructor ends the
+        # program on a finished position
+        try:
+            board.make_board(fen)
+        except (ValueError, IndexError, KeyError):
+            return
+    white = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}.get(game.result)
+    for san in game.moves[:plies]:
+        try:
+            move = board.parse_san(san)
+        except std.IllegalMoveError:
+            return
+        score = white if white is None or board.turn == 0 else 1 - white
+        yield polyglot_hash(board), encode_move(board, move), score
+        board.push(move)
+
+
+def build_book(pgn:str, book:str, plies:int=20, max_positions:int=1_000_000,
+               min_games:int=1) -> tuple[int, int]:
+    """Builds a Polyglot book from a PGN file. Each move is weighted by its score, two
+    points per win and one per draw, scaled down for each position to fit the weights
+    of the book.
+
+    Args:
+        pgn (str): Path of the PGN file
+        book (str): Path of the book to write
+        plies (int, optional): Number of half moves of each game to take. Defaults to 20.
+        max_positions (int, optional): Number of moves to count in memory before spilling
+        them to a run file. Defaults to 1000000.
+        min_games (int, optional): Number of games a move needs to be played in to make
+        the book. Defaults to 1.
+
+    Returns:
+        tuple[int, int]: The number of games read and of entries written
+    """
+    # counts[key, move] = [games, wins, draws]
+    counts:dict[tuple[int, int], list[int]] = {}
+    games = 0
+    with TemporaryDirectory() as directory:
+        runs = []
+        with open(pgn, encoding="utf-8", errors="replace") as file:
+            for game in read_games(file):
+                games += 1
+                for key, move, score in replay(game, plies):
+                    count = counts.get((key, move))
+                    if count is None:
+                        count = counts[key, move] = [0, 0, 0]
+                    count[0] += 1
+                    if score == 1:
+                        count[1] += 1
+                    elif score == 0.5:
+                        count[2] += 1
+                if len(counts) >= max_positions:
+                    runs.append(_write_run(counts, directory, len(runs)))
+                    counts.clear()
+
+        sources = [_read_run(path) for path in runs]
+        sources.append((key, move, *count) for (key, move), count in sorted(counts.items()))
+        with open(book, "wb") as file:
+            entries = _write_book(file, heapq.merge(*sources), min_games)
+    return games, entries
+
+
+def _write_run(counts:dict[tuple[int, int], list[int]], directory:str, index:int) -> str:
+    """Writes the counted moves to a run file, sorted, and returns its path"""
+    path = os.path.join(directory, f"run{index}.bin")
+    with open(path, "wb") as file:
+        for (key, move), count in sorted(counts.items()):
+            file.write(RUN_STRUCT.pack(key, move, *count))
+    return path
+
+
+def _read_run(path:str) -> Iterator[tuple[int, int, int, int, int]]:
+    """Reads a run file back, one counted move at a time"""
+    with open(path, "rb") as file:
+        while (record := file.read(RUN_STRUCT.size)):
+            yield RUN_STRUCT.unpack(record)
+
+
+def _write_book(file:IO[bytes], records:Iterator[tuple[int, int, int, int, int]],
+                min_games:int) -> int:
+    """Adds up the counts of each move across the runs and writes the book entries,
+    one position at a time, and returns the number of entries written
+    """
+    entries = 0
+    position:dict[int, list[int]] = {}
+    current = None
+    for key, move, games, wins, draws in records:
+        if key != current:
+            entries += _write_position(file, current, position, min_games)
+            position = {}
+            current = key
+        count = position.setdefault(move, [0, 0, 0])
+        count[0] += games
+        count[1] += wins
+        count[2] += draws
+    return entries + _write_position(file, current, position, min_games)
+
+
+def _write_position(file:IO[bytes], key:int|None, moves:dict[int, list[int]],
+                    min_games:int) -> int:
+    """Writes the book entries of a position, best weight first, and returns how many"""
+    scores = {move: 2*wins + draws for move, (games, wins, draws) in moves.items()
+              if games >= min_games}
+    if key is None or not scores:
+        return 0
+    highest = max(scores.values())
+    scale = MAX_WEIGHT / highest if highest > MAX_WEIGHT else 1
+    for move, score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+        file.write(ENTRY_STRUCT.pack(key, move, int(score * scale), 0))
+    return len(scores)
+
+
+def main(args:list[str]|None=None) -> int:
+    """Runs the book builder command
+
+    Args:
+        args (list[str]|None, optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Exit status
+    """
+    parser = ArgumentParser(prog="python -m chess.book",
+                            description="Builds a Polyglot opening book from PGN games")
+    parser.add_argument("pgn", help="PGN file to read the games from")
+    parser.add_argument("book", help="Book file to write")
+    parser.add_argument("--plies", type=int, default=20,
+                        help="Number of half moves of each game to take")
+    parser.add_argument("--max-positions", type=int, default=1_000_000,
+                        help="Number of moves counted in memory before spilling to disk")
+    parser.add_argument("--min-games", type=int, default=1,
+                        help="Number of games a move needs to be played in")
+    options = parser.parse_args(args)
+
+    games, entries = build_book(options.pgn, options.book, options.plies,
+                                options.max_positions, options.min_games)
+    print(f"{games} games, {entries} entries written to {options.book}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
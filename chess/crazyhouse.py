@@ -1,104 +1,21 @@
 """Contains the code for the Crazyhouse variant"""
 
+from typing import Iterator
 from chess import standard as std
+from chess.bitboard import BB_ALL, BB_RANKS, scan, between
+from chess.zobrist import ZOBRIST_TURN, ZOBRIST_POCKETS
+from chess.evaluation import MATERIAL
 
 
-class Piece:
-    def delete(self) -> None:
-        """Deletes the piece"""
-        del std.Piece.board[self.pos]
-        std.Piece.board.pieces.remove(self)
-        if std.Piece.board.turn:
-            self.color = 0
-            std.Piece.board.bpocket.append(self)
-        else:
-            self.color = 1
-            std.Piece.board.wpocket.append(self)
-
-    def place(self, pos):
-        for no, square in std.SquareMeta.squares.items():
-            if no == pos:
-                square.piece = self
-                self.pos = no
-                if std.Piece.board.turn:
-                    std.Piece.board.bpocket.remove(self)
-                else:
-                    std.Piece.board.wpocket.remove(self)
-                std.Piece.board.pieces.append(self)
-                break
-
-
-class King(Piece, std.King):pass
-class Queen(Piece, std.Queen):pass
-class Bishop(Piece, std.Bishop):pass
-class Rook(Piece, std.Rook):pass
-class Knight(Piece, std.Knight):pass
-
-
-class Pawn(Piece, std.Pawn):
-    def move(self, move:str) -> None:
-        """A pawn move"""
-        match self.can_move(move):
-            case True:
-                del std.Piece.board[self.pos]
-                self.pos = move
-                std.Piece.board[move].piece = self
-            case (True, std.Piece() as piece):
-                piece.delete()
-                del std.Piece.board[self.pos]
-                self.pos = move
-                std.Piece.board[self.pos].piece = self
-
-            case (True, std.Piece() as piece, True):
-                self.delete()
-                piece.delete()
-                match move[2]:
-                    case "q":
-                        p = std.Queen(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "r":
-                        p = std.Rook(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "n":
-                        p = std.Knight(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "b":
-                        p = std.Bishop(self.color, (ord(move[0])-97, int(move[1])-1))
-                p.promoted = True
-                std.Piece.board[move].piece = p
-                std.Piece.board.pieces.append(p)
-                del self
-
-            case (True, std.Piece() as piece, False):
-                piece.delete()
-                del std.Piece.board[self.pos]
-                self.pos = move
-                std.Piece.board[self.pos].piece = self
-
-            case(True, True):
-                del std.Piece.board[self.pos]
-                std.Piece.board.pieces.remove(self)
-                match move[2]:
-                    case "q":
-                        p = std.Queen(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "r":
-                        p = std.Rook(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "n":
-                        p = std.Knight(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "b":
-                        p = std.Bishop(self.color, (ord(move[0])-97, int(move[1])-1))
-                p.promoted = True
-                std.Piece.board[move].piece = p
-                std.Piece.board.pieces.append(p)
-                del self
+PIECES:dict[str, type[std.Piece]] = {
+    "P": std.Pawn, "N": std.Knight, "B": std.Bishop, "R": std.Rook, "Q": std.Queen}
 
-            case(True, y):
-                del std.Piece.board[self.pos]
-                self.pos = move
-                std.Piece.board[self.pos].piece = self
-                std.Piece.board.en_passant = y
-            case _:
-                raise std.IllegalMoveError(self, move)
-        
-        std.Piece.board.half_moves = 0
 
+class DropUndo(std.Undo):
+    """Everything needed to take back a drop, including where the dropped piece was in
+    the pocket, so the pocket goes back to its order
+    """
+    __slots__ = ("index",)
 
 
 class Board(std.Board):
@@ -109,6 +26,7 @@ class Board(std.Board):
         format_ (str, optional): Time format. Defaults to "5+0".
     """
 
+    __slots__ = ("wpocket", "bpocket")
     starting_fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR/PPP w KQkq - 0 1"
 
     def make_board(self, fen:str) -> None:
@@ -117,39 +35,26 @@ class Board(std.Board):
         Args:
             fen (str): FEN for the board
         """
-        self.pieces:list[std.Piece] = []
-        self.wking:std.King = None
-        self.bking:std.King = None
         self.wpocket:list[std.Piece] = []
         self.bpocket:list[std.Piece] = []
-        self.board = [[std.Square((i, j)) for i in range(8)] for j in range(8)]
-        parts = fen.split()
-        self.turn = 0 if parts[1] == "w" else 1
-        self.en_passant = None if parts[3] == "-" else parts[3]
-        self.half_moves = int(parts[4])
-        self.full_moves = int(parts[5])
-        self.make_pieces(parts[0])
-        self.wking.q = False
-        self.wking.k = False
-        self.bking.q = False
-        self.bking.k = False
-
-        if parts[2] == "-":
-            self.wking.moved = True
-            self.bking.moved = True
-        else:
-            for string in parts[2]:
-                match string:
-                    case "K":
-                        self.wking.q = True
-                    case "Q":
-                        self.wking.k = True
-                    case "k":
-                        self.bking.k = True
-                    case "q":
-                        self.bking.q = True
-                    case _:
-                        raise ValueError("Illegal FEN")
+        super().make_board(fen)
+        for piece in self.wpocket + self.bpocket:
+            self.evaluation += -MATERIAL[piece.type] if piece.color else MATERIAL[piece.type]
+
+    def zobrist_hash(self) -> int:
+        """Computes the Zobrist key of the position from scratch, including the pockets"""
+        key = super().zobrist_hash()
+        for color, pocket in enumerate((self.wpocket, self.bpocket)):
+            for type_ in ZOBRIST_POCKETS:
+                for count in range(sum(piece.type == type_ for piece in pocket)):
+                    key ^= ZOBRIST_POCKETS[type_][color][count]
+        return key
+
+    def _pocket_key(self, pocket:list[std.Piece], type_:str) -> int:
+        """Returns the key of the last piece of the type in the pocket"""
+        color = 1 if pocket is self.bpocket else 0
+        count = sum(piece.type == type_ for piece in pocket)
+        return ZOBRIST_POCKETS[type_][color][count - 1]
 
     def make_pieces(self, pieces:str) -> None:
         """Makes the board
@@ -170,34 +75,34 @@ class Board(std.Board):
                     continue
                 match square:
                     case "r":
-                        piece = Rook(1, current[::-1])
+                        piece = std.Rook(1, current[0]*8 + current[1])
                     case "n":
-                        piece = Knight(1, current[::-1])
+                        piece = std.Knight(1, current[0]*8 + current[1])
                     case "b":
-                        piece = Bishop(1, current[::-1])
+                        piece = std.Bishop(1, current[0]*8 + current[1])
                     case "q":
-                        piece = Queen(1, current[::-1])
+                        piece = std.Queen(1, current[0]*8 + current[1])
                     case "p":
-                        piece = Pawn(1, current[::-1])
+                        piece = std.Pawn(1, current[0]*8 + current[1])
                     case "R":
-                        piece = Rook(0, current[::-1])
+                        piece = std.Rook(0, current[0]*8 + current[1])
                     case "N":
-                        piece = Knight(0, current[::-1])
+                        piece = std.Knight(0, current[0]*8 + current[1])
                     case "B":
-                        piece = Bishop(0, current[::-1])
+                        piece = std.Bishop(0, current[0]*8 + current[1])
                     case "Q":
-                        piece = Queen(0, current[::-1])
+                        piece = std.Queen(0, current[0]*8 + current[1])
                     case "P":
-                        piece = Pawn(0, current[::-1])
+                        piece = std.Pawn(0, current[0]*8 + current[1])
                     case "k":
                         if self.bking:
                             raise ValueError("More than 1 Black King")
-                        piece = std.King(1, current[::-1])
+                        piece = std.King(1, current[0]*8 + current[1])
                         self.bking = piece
                     case "K":
                         if self.wking:
                             raise ValueError("More than 1 White King")
-                        piece = std.King(0, current[::-1])
+                        piece = std.King(0, current[0]*8 + current[1])
                         self.wking = piece
                     case _:
                         raise ValueError("Illegal FEN")
@@ -213,25 +118,25 @@ class Board(std.Board):
         for p in pocket:
             match p:
                 case "r":
-                    piece = std.Rook(1, current[::-1])
+                    piece = std.Rook(1, current[0]*8 + current[1])
                 case "n":
-                    piece = std.Knight(1, current[::-1])
+                    piece = std.Knight(1, current[0]*8 + current[1])
                 case "b":
-                    piece = std.Bishop(1, current[::-1])
+                    piece = std.Bishop(1, current[0]*8 + current[1])
                 case "q":
-                    piece = std.Queen(1, current[::-1])
+                    piece = std.Queen(1, current[0]*8 + current[1])
                 case "p":
-                    piece = Pawn(1, current[::-1])
+                    piece = std.Pawn(1, current[0]*8 + current[1])
                 case "R":
-                    piece = std.Rook(0, current[::-1])
+                    piece = std.Rook(0, current[0]*8 + current[1])
                 case "N":
-                    piece = std.Knight(0, current[::-1])
+                    piece = std.Knight(0, current[0]*8 + current[1])
                 case "B":
-                    piece = std.Bishop(0, current[::-1])
+                    piece = std.Bishop(0, current[0]*8 + current[1])
                 case "Q":
-                    piece = std.Queen(0, current[::-1])
+                    piece = std.Queen(0, current[0]*8 + current[1])
                 case "P":
-                    piece = Pawn(0, current[::-1])
+                    piece = std.Pawn(0, current[0]*8 + current[1])
                 case _:
                     raise ValueError("Illegal FEN")
             if p.islower():
@@ -242,7 +147,7 @@ class Board(std.Board):
     def generate_fen(self) -> str:
         """Genrates FEN for given board"""
         fen = f"{self.generate_piece_fen()}/{self.generate_pocket_fen()} {'b' if self.turn else 'w'} "
-        fen += f"{self.castling()} {self.en_passant or '-'} {self.half_moves} {self.full_moves}"
+        fen += f"{self.castling()} {self.en_passant_fen()} {self.half_moves} {self.full_moves}"
         return fen
 
     def generate_pocket_fen(self) -> str:
@@ -251,42 +156,104 @@ class Board(std.Board):
             ret += str(piece)
         return ret
 
-    def get_moves(self) -> list[str]:
-        """Gets a list of all the moves without filtering checks"""
-        if self.g_moves:
-            if self.g_moves[0] == [self.turn, self.full_moves]:
-                return self.g_moves[1]
-        moves = []
-        for piece in self.pieces:
-            if piece.color == self.turn:
-                moves.extend(map(lambda n: piece.pos+n, piece.get_moves()))
-        for piece in getattr(self, f"{'b' if self.turn else 'w'}pocket"):
-            for no, square in std.SquareMeta.squares.items():
-                if square.piece is None:
-                    if isinstance(piece, Pawn) and no[1] in "18":
-                        pass
-                    elif hasattr(piece, "promoted"):
-                        pass
-                    else:
-                        moves.append(f"@{str(piece)}{no}")
-        self.g_moves = [[self.turn, self.full_moves], moves]
-        return moves
-
-    def _old_play(self, move:str) -> None:
-        before = self.en_passant
-        self.prev = self.generate_fen()
-        if move[0] == "@":
-            piece = None
-            for piece in getattr(self, f"{'b' if self.turn else 'w'}pocket"):
-                if str(piece) == move[1]:
-                    getattr(self, f"{'b' if self.turn else 'w'}pocket").remove(piece)
-                    break
-            piece.place(move[2:])
-        else:
-            self[move[:2]].piece.move(move[2:])
+    def get_moves(self) -> list[std.Move]:
+        """Gets a list of all the moves and drops without filtering checks"""
+        return super().get_moves() + list(self.generate_drops())
+
+    def generate_legal_moves(self) -> Iterator[std.Move]:
+        """Generates the legal moves and drops"""
+        yield from super().generate_legal_moves()
+        king = self.bitboards["K"][self.turn].bit_length() - 1
+        checkers = self.attackers(int(not self.turn), king)
+        if not checkers:
+            yield from self.generate_drops()
+        elif not checkers & (checkers - 1):
+            # A drop can only block a check
+            yield from self.generate_drops(between(king, checkers.bit_length() - 1))
+
+    def generate_drops(self, to_mask:int=BB_ALL) -> Iterator[std.Move]:
+        """Generates the drops of the pieces in the pocket of the player to move
+
+        Args:
+            to_mask (int, optional): bitboard of the squares to drop on. Defaults to all.
+        """
+        empty = ~(self.occupied[0] | self.occupied[1]) & to_mask & BB_ALL
+        pocket = self.bpocket if self.turn else self.wpocket
+        for piece in dict.fromkeys(str(piece) for piece in pocket):
+            # Pawns cannot be dropped on the first or the last rank
+            squares = empty & ~(BB_RANKS[0] | BB_RANKS[7]) if piece in "Pp" else empty
+            for square in scan(squares):
+                yield std.Move(square, square, piece, std.Move.DROP)
+
+    def push(self, move:std.Move) -> None:
+        """Plays the move or drop without checking if it is legal. It can be taken back
+        with pop.
+
+        Args:
+            move (std.Move): The move or drop, as generated by the board
+        """
+        if not move.flags & std.Move.DROP:
+            super().push(move)
+            captured = self.stack[-1].captured
+            if captured is not None:
+                # Promoted pieces go back to being pawns once captured
+                type_ = "P" if captured.promoted else captured.type
+                pocket = self.bpocket if self.turn == 0 else self.wpocket
+                pocket.append(PIECES[type_](int(not self.turn), 0))
+                self.zobrist ^= self._pocket_key(pocket, type_)
+                # The captured piece stays in play, in the capturer's hand
+                self.evaluation += MATERIAL[type_] if self.turn else -MATERIAL[type_]
+            return
+
+        pocket = self.bpocket if self.turn else self.wpocket
+        piece = next(piece for piece in pocket if str(piece) == move.promotion)
+        end = move.to_square
+        undo = DropUndo(move, piece, end, self.castling_rights, self.en_passant, self.half_moves,
+                        self.zobrist, self.evaluation)
+        self.zobrist ^= self._pocket_key(pocket, piece.type)
+        self.evaluation -= -MATERIAL[piece.type] if piece.color else MATERIAL[piece.type]
+        undo.index = pocket.index(piece)
+        del pocket[undo.index]
+        self.stack.append(undo)
+        self.zobrist ^= self._en_passant_key()
+        self.en_passant = None
+        self.half_moves += 1
+        self.pieces.append(piece)
+        self._put(end, piece)
+        self.zobrist ^= ZOBRIST_TURN
+        if self.turn:
+            self.full_moves += 1
+        self.turn = int(not self.turn)
+
+    def pop(self) -> std.Move:
+        """Takes back the last move or drop played with push
+
+        Returns:
+            std.Move: The move taken back
+        """
+        undo = self.stack[-1]
+        if not undo.move.flags & std.Move.DROP:
+            if undo.captured is not None:
+                pocket = self.wpocket if self.turn else self.bpocket
+                type_ = "P" if undo.captured.promoted else undo.captured.type
+                for index in range(len(pocket) - 1, -1, -1):
+                    if pocket[index].type == type_:
+                        del pocket[index]
+                        break
+            return super().pop()
+
+        self.stack.pop()
         self.turn = int(not self.turn)
-        if before and self.en_passant == before:
-            self.en_passant = None
+        if self.turn:
+            self.full_moves -= 1
+        self.en_passant = undo.en_passant
+        self.half_moves = undo.half_moves
+        self._remove(undo.end)
+        self.pieces.remove(undo.piece)
+        (self.bpocket if self.turn else self.wpocket).insert(undo.index, undo.piece)
+        self.zobrist = undo.zobrist
+        self.evaluation = undo.evaluation
+        return undo.move
 
     def play(self, move:str) -> None:
         """Play the given move
@@ -298,27 +265,10 @@ class Board(std.Board):
             IllegalMoveError: If the move is Illegal
             ValueError: If the game is over
         """
-        if not move in self.filter_checks(self.get_moves()):
-            raise std.IllegalMoveError(msg="Illegal move")
-        self.move_fen.append(self.generate_piece_fen())
-        before = self.en_passant
-        self.half_moves += 1
-        if move[0] == "@":
-            for piece in getattr(self, f"{'b' if self.turn else 'w'}pocket"):
-                if str(piece) == move[1]:
-                    getattr(self, f"{'b' if self.turn else 'w'}pocket").remove(piece)
-                    break
-            piece.place(move[2:])
-        else:
-            piece = self[move[:2]].piece
-            piece.move(move[2:])
-        self.turn = int(not self.turn)
-        if before and self.en_passant == before:
-            self.en_passant = None
+        legal = self.parse_uci(move)
         self.moves.append(f"{self.full_moves}. {move}")
         print(f"{self.full_moves}. {move}")
-        if piece.color:
-            self.full_moves += 1
+        self.push(legal)
         self.clock()
         self.print_board()
         print(self.clock.time())
@@ -333,13 +283,11 @@ class Board(std.Board):
             if (not getattr(self, f"{'b' if self.turn else 'w'}pocket")) and self.is_insufficient_material()[self.turn]:
                 msg = "Draw by Time out"
             msg = "Time out!"
-        elif not (moves := self.get_moves()):
-            msg = "Stalemate"
-        elif not self.filter_checks(moves):
-            msg = "Checkmate"
+        elif not self.legal_moves():
+            msg = "Checkmate" if self.is_check() else "Stalemate"
         elif self.half_moves >= 100:
             msg = "Draw by 50 move rule"
-        elif 3 in std.Counter(self.move_fen).values():
+        elif self.is_repetition():
             msg = "Threefold repetition"
         elif not (self.wpocket and self.bpocket) and self.is_insufficient_material()[2]:
             msg = "Insufficient material"
@@ -347,24 +295,3 @@ class Board(std.Board):
             self.clock.stop()
             print(msg)
             exit()
-
-    def __delitem__(self, index:str) -> None:
-        if not check_UCI(index):
-            return None
-        piece = self.board[int(index[1])-1][ord(index[0])-97].piece
-        if isinstance(piece, std.Piece):
-            self.board[int(index[1])-1][ord(index[0])-97].piece = None
-        else:
-            raise ValueError("No piece to remove")
-
-
-def check_UCI(move:str) -> bool:
-    """Checks if the move is correct or not
-
-    Args:
-        move (str): The move to check
-
-    Returns:
-        bool: if the move is according to UCI notation or not
-    """
-    return len(move) == 2 and move[1] in "12345678" and move[0] in "abcdefgh"
@@ -0,0 +1,638 @@
+"""Contains the engine, a negamax alpha-beta search that chooses moves on any board
+
+    >>> from chess import Standard
+    >>> from chess.engine import Engine
+    >>> board = Standard()
+    >>> result = Engine(board).search(time=1.0)
+    >>> board.play(result.move.uci())
+
+In a timed game the engine budgets its time from the board's clock instead:
+
+    >>> Engine(board).play()
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from time import perf_counter
+from typing import NamedTuple
+from chess import standard as std
+from chess.bitboard import BB_SQUARES
+from chess.evaluation import MATERIAL
+from chess.polyglot import Book
+from chess.transposition import TranspositionTable, SharedTranspositionTable
+
+
+MATE = 100000
+# Scores past this bound are mates, MATE minus the number of plies to mate
+MATE_BOUND = MATE - 1000
+INFINITY = MATE + 1
+MAX_PLY = 128
+
+# Move ordering scores: hash move, then captures and promotions, then killers, then
+# quiet moves by history
+HASH_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORES = (1 << 27, (1 << 27) - 1)
+HISTORY_LIMIT = 1 << 26
+# Time management: moves the remaining time is spread over, the share of the increment
+# spent on each move, the time kept back for the clock and the board between the end of
+# the search and the move being played, and how many more times than the soft limit a
+# search may run
+MOVES_TO_GO = 30
+INCREMENT_SHARE = 0.8
+MOVE_OVERHEAD = 0.2
+HARD_LIMIT_FACTOR = 4
+# Depths the best move has to stay the same for before the soft limit is halved
+STABLE_DEPTHS = 3
+# Selective search: the null move search is this many plies shallower (more at high
+# depths), quiet moves after the first few are searched a ply or two shallower, and
+# close to the horizon positions too far below alpha or above beta are cut short
+NULL_MOVE_MIN_DEPTH = 3
+NULL_MOVE_REDUCTION = 2
+REDUCTION_MIN_DEPTH = 3
+REDUCTION_MIN_MOVES = 3
+FUTILITY_MARGINS = (0, 150, 300, 500)
+REVERSE_FUTILITY_MARGIN = 120
+# Captures that cannot lift the score back to alpha even with this margin are skipped
+DELTA_MARGIN = 200
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when the node or time budget runs out"""
+
+
+class SearchResult(NamedTuple):
+    """The result of a search
+
+    Args:
+        move (Move|None): Best move, None if there are no legal moves
+        score (int): Score from the point of view of the player to move
+        depth (int): Deepest depth searched completely
+        pv (list[Move]): Principal variation, starting with the best move
+        nodes (int): Number of positions searched
+        seconds (float): Time the search took
+    """
+    move:std.Move|None
+    score:int
+    depth:int
+    pv:list[std.Move]
+    nodes:int
+    seconds:float
+
+
+class Engine:
+    """A negamax alpha-beta search with iterative deepening and a transposition table.
+    It plays through push and pop and leaves the board as it found it. Moves are
+    searched hash move first, then captures by most valuable victim and least valuable
+    attacker, then killer moves and then quiet moves by history. At the horizon a
+    quiescence search plays out the captures, leaving out those that lose material.
+
+    Moves after the first are searched with a null window, and again with the full
+    window only if they turn out better. Away from the principal variation the search is
+    selective. A null move, letting the opponent move twice, proves most positions too
+    good to need searching; late quiet moves are searched shallower first; and near the
+    horizon quiet moves that cannot reach alpha, and positions far above beta, are
+    pruned. The board decides where a null move is allowed, see Board.allows_null_move.
+
+    Args:
+        board (std.Board): The board to search, of any variant
+        table (TranspositionTable|None, optional): Transposition table. Defaults to a new
+        16 MB table.
+        null_move (bool, optional): Null move pruning. Defaults to True.
+        reductions (bool, optional): Late move reductions. Defaults to True.
+        futility (bool, optional): Futility pruning. Defaults to True.
+        reverse_futility (bool, optional): Reverse futility pruning. Defaults to True.
+    """
+    __slots__ = ("board", "table", "nodes", "max_nodes", "deadline", "pv", "killers",
+                 "history", "cutoffs", "first_move_cutoffs", "null_move", "reductions",
+                 "futility", "reverse_futility", "stats")
+
+    def __init__(self, board:std.Board, table:TranspositionTable|None=None,
+                 null_move:bool=True, reductions:bool=True, futility:bool=True,
+                 reverse_futility:bool=True) -> None:
+        self.board = board
+        self.table = table if table is not None else TranspositionTable()
+        self.null_move = null_move
+        self.reductions = reductions
+        self.futility = futility
+        self.reverse_futility = reverse_futility
+        # Counts of the last search: null move searches, their cutoffs and the nodes
+        # they took; reduced searches, the ones searched again at full depth and the
+        # nodes they took; quiet moves pruned by futility; positions pruned by reverse
+        # futility
+        self.stats:dict[str, int] = dict.fromkeys(STATS, 0)
+        self.nodes = 0
+        self.max_nodes:int|None = None
+        self.deadline:float|None = None
+        # Triangular table of the principal variation found at each ply
+        self.pv:list[list[std.Move]] = [[] for _ in range(MAX_PLY + 1)]
+        # Two quiet moves per ply that caused a cutoff in a sibling position
+        self.killers:list[list[std.Move|None]] = [[None, None] for _ in range(MAX_PLY + 1)]
+        # history[color][from_square*64 + to_square], raised by quiet moves causing cutoffs
+        self.history:tuple[list[int], list[int]] = ([0] * 4096, [0] * 4096)
+        # Beta cutoffs, and those caused by the first move searched
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Share of the beta cutoffs of the last search caused by the first move"""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def play(self, book:Book|None=None) -> SearchResult:
+        """Searches within the time the board's clock allows and plays the best move
+        through Board.play, which moves the clock on. In a known opening the book move is
+        played without searching.
+
+        Args:
+            book (Book|None, optional): Opening book to look the position up in first.
+            Defaults to None.
+
+        Returns:
+            SearchResult: The search that chose the move, of depth 0 for a book move
+        """
+        move = book.weighted_move(self.board) if book is not None else None
+        if move is not None:
+            self.board.play(move.uci())
+            return SearchResult(move, 0, 0, [move], 0, 0.0)
+        soft, hard = allocate_time(self.board.clock, self.board.turn)
+        result = self.search(time=hard, soft_time=soft)
+        if result.move is not None:
+            self.board.play(result.move.uci())
+        return result
+
+    def search(self, depth:int|None=None, nodes:int|None=None, time:float|None=None,
+               soft_time:float|None=None) -> SearchResult:
+        """Searches the position one depth at a time until the depth or a budget is reached
+
+        Args:
+            depth (int|None, optional): Deepest depth to search. Defaults to 4, or to no
+            limit when a node or time budget is given.
+            nodes (int|None, optional): Number of positions to search at most.
+            Defaults to None.
+            time (float|None, optional): Seconds to search at most, aborting the depth
+            being searched. Defaults to None.
+            soft_time (float|None, optional): Seconds after which no new depth is started,
+            halved once the best move has stayed the same for a few depths.
+            Defaults to None.
+
+        Returns:
+            SearchResult: The best move and score of the deepest completed depth
+        """
+        if depth is None:
+            depth = MAX_PLY if nodes or time or soft_time else 4
+        start = perf_counter()
+        self.nodes = 0
+        self.max_nodes = nodes
+        self.deadline = start + time if time else None
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.stats = dict.fromkeys(STATS, 0)
+        self.table.new_search()
+        for killers in self.killers:
+            killers[0] = killers[1] = None
+        for history in self.history:
+            history[:] = [value // 2 for value in history]
+
+        result = None
+        stable = 0
+        for current in range(1, min(depth, MAX_PLY) + 1):
+            try:
+                score = self.negamax(current, -INFINITY, INFINITY, 0)
+            except SearchAborted:
+                break
+            pv = list(self.pv[0])
+            stable = stable + 1 if result is not None and pv and result.move == pv[0] else 0
+            result = SearchResult(pv[0] if pv else None, score, current, pv, self.nodes,
+                                  perf_counter() - start)
+            # A shorter mate cannot turn up deeper
+            if not pv or abs(score) >= MATE_BOUND:
+                break
+            if soft_time is not None:
+                limit = soft_time / 2 if stable >= STABLE_DEPTHS else soft_time
+                if result.seconds >= limit:
+                    break
+
+        if result is None:
+            # The budget ran out during the first depth
+            moves = self.board.legal_moves()
+            move = self.pv[0][0] if self.pv[0] else (moves[0] if moves else None)
+            result = SearchResult(move, 0, 0, [move] if move else [], self.nodes,
+                                  perf_counter() - start)
+        return result
+
+    def negamax(self, depth:int, alpha:int, beta:int, ply:int, null:bool=True) -> int:
+        """Searches the position
+
+        Args:
+            depth (int): Remaining depth
+            alpha (int): Score the player to move is already sure of
+            beta (int): Score the opponent is already sure of
+            ply (int): Distance from the root
+            null (bool, optional): If a null move may be tried, False right after one.
+            Defaults to True.
+
+        Raises:
+            SearchAborted: If the node or time budget runs out
+
+        Returns:
+            int: Score from the point of view of the player to move
+        """
+        if depth <= 0 or ply >= MAX_PLY:
+            return self.quiescence(alpha, beta, ply)
+        board = self.board
+        self.count_node()
+        self.pv[ply] = []
+
+        outcome = board.outcome()
+        if outcome is not None:
+            return outcome * (MATE - ply)
+        if ply and (board.half_moves >= 100 or board.is_repetition(2)):
+            return 0
+
+        entry = self.table.probe(board.zobrist)
+        hash_move = None
+        if entry is not None:
+            hash_move = entry.move
+            if ply and entry.depth >= depth:
+                score = _from_table(entry.score, ply)
+                if (entry.bound == TranspositionTable.EXACT
+                        or entry.bound == TranspositionTable.LOWER and score >= beta
+                        or entry.bound == TranspositionTable.UPPER and score <= alpha):
+                    return score
+
+        stats = self.stats
+        in_check = board.is_check()
+        # Pruning only applies to null window searches out of check
+        selective = ply and beta - alpha == 1 and not in_check
+        static = board.evaluate() if selective else 0
+        if (selective and self.reverse_futility and depth < len(FUTILITY_MARGINS)
+                and abs(beta) < MATE_BOUND and static - REVERSE_FUTILITY_MARGIN * depth >= beta):
+            stats["reverse_futility"] += 1
+            return static
+        if (selective and self.null_move and null and depth >= NULL_MOVE_MIN_DEPTH
+                and static >= beta and board.allows_null_move()):
+            score = self.null_move_search(depth, beta, ply)
+            if score >= beta:
+                # A mate found after passing is not a real one
+                return beta if score >= MATE_BOUND else score
+        futile = (selective and self.futility and depth < len(FUTILITY_MARGINS)
+                  and abs(alpha) < MATE_BOUND and static + FUTILITY_MARGINS[depth] <= alpha)
+
+        moves = self.order_moves(board.legal_moves(), hash_move, ply)
+        killers = self.killers[ply]
+
+        original_alpha = alpha
+        best = -INFINITY
+        best_move = None
+        for index, move in enumerate(moves):
+            quiet = not self.is_capture(move)
+            board.push(move)
+            try:
+                quiet = quiet and not board.is_check()
+                if futile and index and quiet:
+                    stats["futility"] += 1
+                    continue
+                if not index:
+                    score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+                else:
+                    # The first move is expected to be best, the others only have to be
+                    # shown to be worse, which a null window does faster
+                    if (self.reductions and quiet and depth >= REDUCTION_MIN_DEPTH
+                            and index >= REDUCTION_MIN_MOVES and move not in killers
+                            and not in_check):
+                        score = self.reduced_search(depth, alpha, index, ply)
+                    else:
+                        score = alpha + 1
+                    if score > alpha:
+                        score = -self.negamax(depth - 1, -alpha - 1, -alpha, ply + 1)
+                    if alpha < score < beta:
+                        score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+            if score > best:
+                best = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    self.pv[ply] = [move] + self.pv[ply + 1]
+                    if alpha >= beta:
+                        self.cutoffs += 1
+                        if not index:
+                            self.first_move_cutoffs += 1
+                        if not self.is_capture(move):
+                            self.update_quiet(move, depth, ply)
+                        break
+
+        if best >= beta:
+            bound = TranspositionTable.LOWER
+        elif best > original_alpha:
+            bound = TranspositionTable.EXACT
+        else:
+            bound = TranspositionTable.UPPER
+        self.table.store(board.zobrist, depth, bound, _to_table(best, ply), best_move)
+        return best
+
+    def null_move_search(self, depth:int, beta:int, ply:int) -> int:
+        """Passes the turn and searches shallower with a null window around beta. If the
+        opponent cannot bring the score below beta even with two moves in a row, the
+        position is good enough to cut.
+
+        Returns:
+            int: Score of the null move from the point of view of the player to move
+        """
+        stats = self.stats
+        stats["null_move_searches"] += 1
+        nodes = self.nodes
+        reduction = NULL_MOVE_REDUCTION + depth // 6
+        self.board.push_null()
+        try:
+            score = -self.negamax(depth - 1 - reduction, -beta, -beta + 1, ply + 1, False)
+        finally:
+            self.board.pop_null()
+            stats["null_move_nodes"] += self.nodes - nodes
+        if score >= beta:
+            stats["null_move_cutoffs"] += 1
+        return score
+
+    def reduced_search(self, depth:int, alpha:int, index:int, ply:int) -> int:
+        """Searches a late quiet move, already played, shallower with a null window
+        around alpha. Moves this far down the ordering rarely raise alpha, and those that
+        do are searched again at full depth.
+
+        Returns:
+            int: Score of the move from the point of view of the player who played it
+        """
+        stats = self.stats
+        stats["reductions"] += 1
+        nodes = self.nodes
+        reduction = 1 if index < 2 * REDUCTION_MIN_MOVES + 2 else 2
+        try:
+            score = -self.negamax(max(depth - 1 - reduction, 1), -alpha - 1, -alpha, ply + 1)
+        finally:
+            stats["reduction_nodes"] += self.nodes - nodes
+        if score > alpha:
+            stats["re_searches"] += 1
+        return score
+
+    def count_node(self) -> None:
+        """Counts a searched position
+
+        Raises:
+            SearchAborted: If the node or time budget has run out
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchAborted
+        # A node takes far longer than reading the clock, so it is read at every one
+        if self.deadline is not None and perf_counter() > self.deadline:
+            raise SearchAborted
+
+    def quiescence(self, alpha:int, beta:int, ply:int) -> int:
+        """Searches the captures and promotions until the position is quiet, so the
+        evaluation is not taken in the middle of an exchange. Out of check, the player to
+        move can stand pat instead of capturing, where the board allows it.
+
+        Args:
+            alpha (int): Score the player to move is already sure of
+            beta (int): Score the opponent is already sure of
+            ply (int): Distance from the root
+
+        Raises:
+            SearchAborted: If the node or time budget runs out
+
+        Returns:
+            int: Score from the point of view of the player to move
+        """
+        board = self.board
+        self.count_node()
+        self.pv[ply] = []
+        outcome = board.variant_outcome()
+        if outcome is not None:
+            return outcome * (MATE - ply)
+        if ply >= MAX_PLY:
+            return board.evaluate()
+
+        if board.is_check():
+            # Every evasion has to be tried, and having none is mate
+            moves = board.legal_moves()
+            if not moves:
+                return board.outcome() * (MATE - ply)
+            best = -INFINITY
+            stand_pat = None
+        elif not board.allows_stand_pat():
+            # Capturing is compulsory, so one of the captures has to be played
+            moves = list(board.generate_legal_captures())
+            if not moves:
+                return board.outcome() * (MATE - ply)
+            best = -INFINITY
+            stand_pat = None
+        else:
+            stand_pat = best = board.evaluate()
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            moves = list(board.generate_legal_captures())
+
+        squares = board.squares
+        # Captures that cannot reach alpha or that lose material in the exchange are not
+        # worth following, where the board lets material decide
+        pruning = stand_pat is not None and board.static_exchange
+        for move in self.order_moves(moves, None, ply):
+            if pruning and not move.promotion:
+                victim = squares[move.to_square].piece
+                gain = MATERIAL[victim.type] if victim is not None else MATERIAL["P"]
+                if stand_pat + gain + DELTA_MARGIN <= alpha:
+                    continue
+            if pruning and board.see(move) < 0:
+                continue
+            board.push(move)
+            try:
+                score = -self.quiescence(-beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+    def is_capture(self, move:std.Move) -> bool:
+        """Checks if the move captures or promotes, which keeps it out of the killers and
+        history
+        """
+        return bool(move.promotion and not move.flags & std.Move.DROP
+                    or move.flags & std.Move.EN_PASSANT
+                    or self.board.occupied[not self.board.turn] & BB_SQUARES[move.to_square])
+
+    def order_moves(self, moves:list[std.Move], hash_move:std.Move|None,
+                    ply:int) -> list[std.Move]:
+        """Sorts the moves so the ones most likely to cause a cutoff come first
+
+        Args:
+            moves (list[std.Move]): The legal moves
+            hash_move (std.Move|None): Best move stored in the transposition table
+            ply (int): Distance from the root
+
+        Returns:
+            list[std.Move]: The moves, best first
+        """
+        board = self.board
+        squares = board.squares
+        them = board.occupied[not board.turn]
+        killers = self.killers[ply]
+        history = self.history[board.turn]
+        scores = {}
+        for move in moves:
+            if move == hash_move:
+                score = HASH_MOVE_SCORE
+            elif not move.flags & std.Move.DROP and (them & BB_SQUARES[move.to_square]
+                    or move.flags & std.Move.EN_PASSANT or move.promotion):
+                victim = squares[move.to_square].piece
+                attacker = squares[move.from_square].piece
+                score = CAPTURE_SCORE - MATERIAL[attacker.type] // 10
+                if victim is not None and victim.color != attacker.color:
+                    score += 10 * MATERIAL[victim.type]
+                elif move.flags & std.Move.EN_PASSANT:
+                    score += 10 * MATERIAL["P"]
+                if move.promotion:
+                    score += MATERIAL[move.promotion.upper()]
+            elif move == killers[0]:
+                score = KILLER_SCORES[0]
+            elif move == killers[1]:
+                score = KILLER_SCORES[1]
+            else:
+                score = history[move.from_square * 64 + move.to_square]
+            scores[move] = score
+        return sorted(moves, key=scores.__getitem__, reverse=True)
+
+    def update_quiet(self, move:std.Move, depth:int, ply:int) -> None:
+        """Remembers a quiet move that caused a cutoff as a killer and in the history"""
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        history = self.history[self.board.turn]
+        index = move.from_square * 64 + move.to_square
+        history[index] = min(history[index] + depth * depth, HISTORY_LIMIT)
+
+
+# Keys of Engine.stats
+STATS = ("null_move_searches", "null_move_cutoffs", "null_move_nodes", "reductions",
+         "re_searches", "reduction_nodes", "futility", "reverse_futility")
+
+
+def _search_task(variant:type[std.Board], fen:str, moves:tuple[std.Move, ...],
+                 table:SharedTranspositionTable, helper:int, depth:int|None,
+                 nodes:int|None, time:float|None, soft_time:float|None) -> SearchResult:
+    """Rebuilds the position from the FEN and the moves played since, then searches it.
+    Runs in the worker processes of parallel_search. Helpers other than the first search
+    odd ones one depth deeper and start from a slightly shuffled history, so they
+    order their moves differently and fill the shared table with other parts of the tree.
+    """
+    board = variant(fen)
+    for move in moves:
+        board.push(move)
+    engine = Engine(board, table)
+    if helper:
+        random = Random(helper)
+        for history in engine.history:
+            history[:] = [random.randrange(256) for _ in history]
+        if depth is not None and helper & 1:
+            depth += 1
+    try:
+        return engine.search(depth, nodes, time, soft_time)
+    finally:
+        table.close()
+
+
+def parallel_search(board:std.Board, workers:int|None=None, depth:int|None=None,
+                    nodes:int|None=None, time:float|None=None, soft_time:float|None=None,
+                    size_mb:float=64) -> SearchResult:
+    """Searches the position in several processes at once, sharing one transposition
+    table in shared memory, in the manner of lazy SMP. Each process rebuilds the board
+    from its FEN and move history, since boards are not sent between processes. The
+    result searched deepest wins, the first process's on a tie.
+
+    Args:
+        board (std.Board): The board to search, of any variant. It is left as it was.
+        workers (int|None, optional): Number of processes. Defaults to one per core.
+        depth (int|None, optional): Deepest depth to search, see Engine.search.
+        Defaults to None.
+        nodes (int|None, optional): Positions each process searches at most.
+        Defaults to None.
+        time (float|None, optional): Seconds to search at most. Defaults to None.
+        soft_time (float|None, optional): Seconds after which no new depth is started.
+        Defaults to None.
+        size_mb (float, optional): Size of the shared table in megabytes. Defaults to 64.
+
+    Returns:
+        SearchResult: The chosen search, with the nodes of every process added up
+    """
+    workers = workers or os.cpu_count() or 1
+    moves = tuple(undo.move for undo in board.stack)
+    for _ in moves:
+        board.pop()
+    fen = board.generate_fen()
+    for move in moves:
+        board.push(move)
+
+    start = perf_counter()
+    table = SharedTranspositionTable(size_mb)
+    try:
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(_search_task, type(board), fen, moves, table, helper,
+                                       depth, nodes, time, soft_time)
+                       for helper in range(workers)]
+            results = [future.result() for future in futures]
+    finally:
+        table.close()
+    best = max(results, key=lambda result: result.depth)
+    return best._replace(nodes=sum(result.nodes for result in results),
+                         seconds=perf_counter() - start)
+
+
+def allocate_time(clock:std.Clock, color:int) -> tuple[float, float]:
+    """Splits the time left on the clock into a budget for the next move. The delay is
+    spent before the clock starts running, so it is free, and part of the increment is
+    spent ahead as it comes back after the move.
+
+    Args:
+        clock (std.Clock): The clock of the game
+        color (int): Color of the player to move
+
+    Returns:
+        tuple[float, float]: Seconds after which no new depth should be started, and
+        seconds the search must not go past
+    """
+    remaining = (clock.black if color else clock.white) / 10
+    increment = clock.increment / 10
+    delay = clock.delay / 10
+    # Clock time that can be spent, the overhead kept back
+    spare = max(remaining - MOVE_OVERHEAD, 0.0)
+    soft = remaining / MOVES_TO_GO + INCREMENT_SHARE * increment + delay
+    # Never more than half the spare time, and never past the time left on the clock
+    hard = min(soft * HARD_LIMIT_FACTOR, spare * 0.5 + delay, remaining + delay - MOVE_OVERHEAD)
+    hard = max(hard, 0.01)
+    return min(soft, hard), hard
+
+
+def _to_table(score:int, ply:int) -> int:
+    """Stores mate scores as the distance to mate from the position instead of the root"""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _from_table(score:int, ply:int) -> int:
+    """Turns a mate score from the table back into the distance from the root"""
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
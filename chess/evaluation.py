@@ -0,0 +1,119 @@
+"""Contains the piece-square tables the boards keep their evaluation with
+
+A table set maps each piece type to a pair of tables, white's and black's, giving the
+value of the piece on each square, material included, from white's point of view.
+Boards add and subtract these values as pieces are placed and removed, so the
+evaluation is always up to date without looking at every piece.
+"""
+
+from chess.bitboard import square_distance
+
+
+MATERIAL = {"K": 0, "Q": 900, "R": 500, "B": 330, "N": 320, "P": 100}
+# Static exchange values: a king can only capture last, so losing it outweighs everything
+SEE_VALUES = {**MATERIAL, "K": 20000}
+
+# Bonuses for white pieces, written as seen from white's side with a8 first
+PAWN = (
+     0,  0,  0,  0,  0,  0,  0,  0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+     5,  5, 10, 25, 25, 10,  5,  5,
+     0,  0,  0, 20, 20,  0,  0,  0,
+     5, -5,-10,  0,  0,-10, -5,  5,
+     5, 10, 10,-20,-20, 10, 10,  5,
+     0,  0,  0,  0,  0,  0,  0,  0)
+KNIGHT = (
+   -50,-40,-30,-30,-30,-30,-40,-50,
+   -40,-20,  0,  0,  0,  0,-20,-40,
+   -30,  0, 10, 15, 15, 10,  0,-30,
+   -30,  5, 15, 20, 20, 15,  5,-30,
+   -30,  0, 15, 20, 20, 15,  0,-30,
+   -30,  5, 10, 15, 15, 10,  5,-30,
+   -40,-20,  0,  5,  5,  0,-20,-40,
+   -50,-40,-30,-30,-30,-30,-40,-50)
+BISHOP = (
+   -20,-10,-10,-10,-10,-10,-10,-20,
+   -10,  0,  0,  0,  0,  0,  0,-10,
+   -10,  0,  5, 10, 10,  5,  0,-10,
+   -10,  5,  5, 10, 10,  5,  5,-10,
+   -10,  0, 10, 10, 10, 10,  0,-10,
+   -10, 10, 10, 10, 10, 10, 10,-10,
+   -10,  5,  0,  0,  0,  0,  5,-10,
+   -20,-10,-10,-10,-10,-10,-10,-20)
+ROOK = (
+     0,  0,  0,  0,  0,  0,  0,  0,
+     5, 10, 10, 10, 10, 10, 10,  5,
+    -5,  0,  0,  0,  0,  0,  0, -5,
+    -5,  0,  0,  0,  0,  0,  0, -5,
+    -5,  0,  0,  0,  0,  0,  0, -5,
+    -5,  0,  0,  0,  0,  0,  0, -5,
+    -5,  0,  0,  0,  0,  0,  0, -5,
+     0,  0,  0,  5,  5,  0,  0,  0)
+QUEEN = (
+   -20,-10,-10, -5, -5,-10,-10,-20,
+   -10,  0,  0,  0,  0,  0,  0,-10,
+   -10,  0,  5,  5,  5,  5,  0,-10,
+    -5,  0,  5,  5,  5,  5,  0, -5,
+     0,  0,  5,  5,  5,  5,  0, -5,
+   -10,  5,  5,  5,  5,  5,  0,-10,
+   -10,  0,  5,  0,  0,  0,  0,-10,
+   -20,-10,-10, -5, -5,-10,-10,-20)
+KING = (
+   -30,-40,-40,-50,-50,-40,-40,-30,
+   -30,-40,-40,-50,-50,-40,-40,-30,
+   -30,-40,-40,-50,-50,-40,-40,-30,
+   -30,-40,-40,-50,-50,-40,-40,-30,
+   -20,-30,-30,-40,-40,-30,-30,-20,
+   -10,-20,-20,-20,-20,-20,-20,-10,
+    20, 20,  0,  0,  0,  0, 20, 20,
+    20, 30, 10,  0,  0, 10, 30, 20)
+ZERO = (0,) * 64
+
+BONUSES = {"K": KING, "Q": QUEEN, "R": ROOK, "B": BISHOP, "N": KNIGHT, "P": PAWN}
+
+# King of the Hill: the closer the king is to the centre, the closer it is to winning
+CENTRE_KING = tuple(
+    60 * (3 - min(square_distance(square, centre) for centre in (27, 28, 35, 36)))
+    for square in (rank*8 + file for rank in range(7, -1, -1) for file in range(8)))
+# Racing Kings: both kings race to the eighth rank
+RACING_KING = tuple(80 * (7 - index // 8) for index in range(64))
+# Horde: the horde's pawns are its only hope of promoting, and the central files hold
+# its chain together
+HORDE_PAWN = tuple(
+    (0 if index // 8 in (0, 7) else 8 * (7 - index // 8) + (10 if 2 <= index % 8 <= 5 else 0))
+    for index in range(64))
+
+
+def make_tables(material:dict[str, int], bonuses:dict[str, tuple[int, ...]],
+                mirror:bool=True) -> dict[str, tuple[list[int], list[int]]]:
+    """Makes a table set
+
+    Args:
+        material (dict[str, int]): Value of each piece type
+        bonuses (dict[str, tuple[int, ...]]): Bonus by square for each white piece type,
+        a8 first
+        mirror (bool, optional): If black's bonuses are white's mirrored vertically,
+        otherwise black uses white's squares as they are. Defaults to True.
+
+    Returns:
+        dict[str, tuple[list[int], list[int]]]: white's and black's table of each type
+    """
+    tables = {}
+    for type_, bonus in bonuses.items():
+        # Turn the a8 first layout into square indices
+        white = [material[type_] + bonus[(7 - square // 8) * 8 + square % 8]
+                 for square in range(64)]
+        black = [-white[square ^ 56] if mirror else -white[square] for square in range(64)]
+        tables[type_] = (white, black)
+    return tables
+
+
+STANDARD_TABLES = make_tables(MATERIAL, BONUSES)
+# Antichess: every piece is a burden, kings included
+ANTICHESS_TABLES = make_tables({type_: -value for type_, value in {**MATERIAL, "K": 200}.items()},
+                               dict.fromkeys(BONUSES, ZERO))
+KING_OF_THE_HILL_TABLES = make_tables(MATERIAL, {**BONUSES, "K": CENTRE_KING})
+RACING_KINGS_TABLES = make_tables(MATERIAL, {**dict.fromkeys(BONUSES, ZERO), "K": RACING_KING},
+                                  mirror=False)
+HORDE_TABLES = make_tables(MATERIAL, {**BONUSES, "P": HORDE_PAWN})
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from tkinter import Label, PhotoImage, Button, SUNKEN, Tk, Frame
 from chess.standard import Board, Square, Piece
+from chess.bitboard import SQUARES
 
 
 class ChessGUI:
@@ -37,8 +38,10 @@ class GuiPiece(Label):
     pieces:list[GuiPiece] = []
     iimg = "/home/alumin112/Desktop/Python Projects/Chess/chess/assets/{}{}.png"
 
-    def __init__(self, piece:Piece,**kwargs) -> None:
-        self.orgX = piece.pos[0] *100
+    def __init__(self, piece:Piece, board:Board, **kwargs) -> None:
+        # Each piece plays on its own GUI's board
+        self.board = board
+        self.orgX = (piece.pos & 7) *100
         self.orgY = rank *100
         self.type = type_
         img = "/home/alumin112/Desktop/Python Projects/Chess/chess/assets/" + img
@@ -72,23 +75,23 @@ class GuiPiece(Label):
         orgpos = self.orgX//100, (self.orgY//100 - 4)*-1 + 3
         if pos != orgpos:
             move = f"{chr(orgpos[0]+97)}{orgpos[1]+1}{chr(pos[0]+97)}{pos[1]+1}"
-            if Piece.board.can_play(move):
+            if self.board.can_play(move):
                 if self.type == "P" and move[3] in "18":
                     self.orgX, self.orgY = posi
                     choice = 1 if move[3] == "8" else -1
                     for val, name in enumerate(["rook", "queen", "bishop", "knight"]):
                         photo = PhotoImage(
-                file=self.iimg.format('b' if Piece.board[move].piece.color else 'w', name))
+                file=self.iimg.format('b' if self.board[SQUARES[move[:2]]].piece.color else 'w', name))
                         button = Button(Piece.root, font=("Arial", 20), relief=SUNKEN, bd=2,
                                     command=lambda n=name:self.radio(move, n,
-                                    Piece.board[move].piece.color), image=photo)
+                                    self.board[SQUARES[move[:2]]].piece.color), image=photo)
                         button.photo = photo
                         Piece.buttons.append(button)
                         button.place(x=self.orgX, y=self.orgY+(choice* (100+ val*100)))
 
                 elif not Piece.buttons:
                     self.orgX, self.orgY = posi
-                    Piece.board.play(move)
+                    self.board.play(move)
 
         self.place(x=self.orgX, y=self.orgY)
 
@@ -96,7 +99,7 @@ class GuiPiece(Label):
         self.photo = PhotoImage(file=self.iimg.format('b' if color else 'w', name))
         self.config(image=self.photo)
         self.type = name[(1 if name=="knight" else 0)].upper()
-        Piece.board.play(move+name[(1 if name=="knight" else 0)])
+        self.board.play(move+name[(1 if name=="knight" else 0)])
         for button in self.buttons:
             button.destroy()
         Piece.buttons = []
@@ -1,55 +1,22 @@
 """Contains the code for the Horde variant"""
 
 from chess import standard as std
+from chess.bitboard import BB_RANKS, BB_SQUARES, BB_FILES, popcount, scan
+from chess.evaluation import HORDE_TABLES
 
 
-class Pawn(std.Pawn):
-    def can_move(self, move:str
-            ) -> tuple[bool, None|std.Piece|str|bool]|tuple[bool, None|std.Piece, bool]|bool:
-        if self.is_occupied(move):
-            return False
-        if self.is_occupied(move, True) and not self.can_capture(move):
-            return False
-        if self.pos[0] == move[0]:
-            match int(self.pos[1]) - int(move[1]):
-                case 1 if self.color:
-                    if move[1] == "1":
-                        return True, True
-                    return True
-                case -1 if not self.color:
-                    if move[1] == "8":
-                        return True, True
-                    return True
-                case 2 if self.color and self.pos[1] == "7":
-                    if self.is_occupied(f"{self.pos[0]}6", both=True):
-                        return False
-                    return True, f"{self.pos[0]}6"
-                case 2 if self.color and self.pos[1] == "8":
-                    if self.is_occupied(f"{self.pos[0]}7", both=True):
-                        return False
-                    return True
-                case -2 if not self.color and self.pos[1] == "2":
-                    if self.is_occupied(f"{self.pos[0]}3", both=True):
-                        return False
-                    return True, f"{self.pos[0]}3"
-                case -2 if not self.color and self.pos[1] == "1":
-                    if self.is_occupied(f"{self.pos[0]}2", both=True):
-                        return False
-                    return True
-            return False
-        b = self.can_move_diagonally(move, True, True)
-        if self.is_occupied(move, True):
-            if not self.can_move_diagonally(move, True):
-                return False
-            return (bool((b and not self.color) or (not b and self.color)), 
-                    std.Piece.board[move].piece, move[1] == ("1" if self.color else "8"))
-        if std.Piece.board.en_passant == move:
-            if not self.can_move_diagonally(move, True):
-                return False
-            return (bool((b and not self.color) or (not b and self.color)),
-                    std.Piece.board[f"{move[0]}{int(move[1]) + (1 if move[1] == '3' else -1)}"].piece)
-        return False
-
+def _file_structure(pawns:int, file:int) -> int:
+    """Score of the horde's pawns on the file. Pawns stacked on a file or left without
+    neighbouring files are easier for black to pick off.
+    """
+    count = popcount(pawns & BB_FILES[file])
+    if not count:
+        return 0
+    score = -8 * (count - 1)
+    neighbours = (BB_FILES[file - 1] if file else 0) | (BB_FILES[file + 1] if file < 7 else 0)
+    if not pawns & neighbours:
+        score -= 15 * count
+    return score
 
 
 class Board(std.Board):
@@ -59,11 +26,11 @@ class Board(std.Board):
         fen (str, optional): starting FEN. Defaults to the standard starting FEN.
         format_ (str, optional): Time format. Defaults to "5+0".
     """
-
+    __slots__ = ("king", "structure")
     starting_fen = "rnbqkbnr/pppppppp/8/1PP2PP1/PPPPPPPP/PPPPPPPP/PPPPPPPP/PPPPPPPP w kq - 0 1"
-
-    def __init__(self, format_:str="5+0") -> None:
-        super().__init__("", format_)
+    # White pawns on the first rank can move two squares as well
+    double_push_ranks = (BB_RANKS[0] | BB_RANKS[1], BB_RANKS[6])
+    piece_square_tables = HORDE_TABLES
 
     def make_board(self, fen:str) -> None:
         """Makes the board
@@ -71,52 +38,52 @@ class Board(std.Board):
         Args:
             fen (str): FEN for the board
         """
-        self.pieces:list[std.Piece] = []
         self.king:std.King = None
-        self.board = [[std.Square((i, j)) for i in range(8)] for j in range(8)]
-        parts = fen.split()
-        self.turn = 0 if parts[1] == "w" else 1
-        self.en_passant = None if parts[3] == "-" else parts[3]
-        self.half_moves = int(parts[4])
-        self.full_moves = int(parts[5])
-        self.make_pieces(parts[0])
-        self.king.q = False
-        self.king.k = False
+        super().make_board(fen)
+        # Pawn structure score of the horde, updated by every move that changes the
+        # number of its pawns on a file
+        pawns = self.bitboards["P"][0]
+        self.structure = sum(_file_structure(pawns, file) for file in range(8))
 
-        if parts[2] == "-":
-            self.king.moved = True
-        else:
-            for string in parts[2]:
-                match string:
-                    case "k":
-                        self.king.k = True
-                    case "q":
-                        self.king.q = True
-                    case _:
-                        raise ValueError("Illegal FEN")
-
-    def filter_checks(self, moves:list[str]) -> list[str]:
-        """Filters the moves to remove checks
+    def push(self, move:std.Move) -> None:
+        """Plays the move without checking if it is legal. It can be taken back with pop.
 
         Args:
-            moves (list[str]): List of moves
+            move (std.Move): The move, as generated by the board
+        """
+        pawns = self.bitboards["P"][0]
+        super().push(move)
+        # A pawn moving two squares from the first rank cannot be taken en passant
+        if move.flags & std.Move.DOUBLE_PUSH and BB_SQUARES[move.from_square] & BB_RANKS[0]:
+            self.zobrist ^= self._en_passant_key()
+            self.en_passant = None
+        if pawns != self.bitboards["P"][0]:
+            self._update_structure(pawns)
+
+    def pop(self) -> std.Move:
+        """Takes back the last move played with push
 
         Returns:
-            list[str]: Filtered list of moves
+            std.Move: The move taken back
         """
-        if self.turn == 0:
-            return moves
-        if self.filter_moves:
-            if self.filter_moves[0] == [self.turn, self.full_moves]:
-                return self.filter_moves[1]
-        filtered = []
-        for move in moves:
-            self._old_play(move)
-            if not std.Square[self.king.pos].is_attacked():
-                filtered.append(move)
-            self.reverse()
-        self.filter_moves = [[self.turn, self.full_moves], filtered]
-        return filtered
+        pawns = self.bitboards["P"][0]
+        move = super().pop()
+        if pawns != self.bitboards["P"][0]:
+            self._update_structure(pawns)
+        return move
+
+    def _update_structure(self, before:int) -> None:
+        """Updates the pawn structure score after the horde's pawns moved. Only the files
+        that gained or lost a pawn and their neighbours are scored again.
+        """
+        pawns = self.bitboards["P"][0]
+        files = set()
+        for square in scan(before ^ pawns):
+            file = square & 7
+            if popcount(before & BB_FILES[file]) != popcount(pawns & BB_FILES[file]):
+                files.update(range(max(file - 1, 0), min(file + 2, 8)))
+        for file in files:
+            self.structure += _file_structure(pawns, file) - _file_structure(before, file)
 
     def make_pieces(self, pieces:str) -> None:
         """Makes the board
@@ -135,21 +102,21 @@ class Board(std.Board):
                     continue
                 match square:
                     case "r":
-                        piece = std.Rook(1, current[::-1])
+                        piece = std.Rook(1, current[0]*8 + current[1])
                     case "n":
-                        piece = std.Knight(1, current[::-1])
+                        piece = std.Knight(1, current[0]*8 + current[1])
                     case "b":
-                        piece = std.Bishop(1, current[::-1])
+                        piece = std.Bishop(1, current[0]*8 + current[1])
                     case "q":
-                        piece = std.Queen(1, current[::-1])
+                        piece = std.Queen(1, current[0]*8 + current[1])
                     case "p":
-                        piece = std.Pawn(1, current[::-1])
+                        piece = std.Pawn(1, current[0]*8 + current[1])
                     case "P":
-                        piece = Pawn(0, current[::-1])
+                        piece = std.Pawn(0, current[0]*8 + current[1])
                     case "k":
                         if self.king:
                             raise ValueError("More than 1 Black King")
-                        piece = std.King(1, current[::-1])
+                        piece = std.King(1, current[0]*8 + current[1])
                         self.king = piece
                     case _:
                         raise ValueError("Illegal FEN")
@@ -159,6 +126,25 @@ class Board(std.Board):
             current[0] += 1
             current[1] = 0
 
+    def evaluate(self) -> int:
+        """Returns the static evaluation from the point of view of the player to move,
+        with the horde's pawn structure weighed in
+        """
+        score = self.evaluation + self.structure
+        return -score if self.turn else score
+
+    def allows_null_move(self) -> bool:
+        """The horde is never allowed to pass, its pawns are often in zugzwang"""
+        return self.turn == 1 and super().allows_null_move()
+
+    def variant_outcome(self) -> int|None:
+        """Checks if the rules have decided the game. The horde loses once it has no pieces
+        left.
+        """
+        if not self.occupied[0]:
+            return -1 if self.turn == 0 else 1
+        return None
+
     def is_over(self) -> None:
         """Ends the game if the game is over"""
         msg = ""
@@ -167,16 +153,14 @@ class Board(std.Board):
                 msg = "Draw by Time out"
             else:
                 msg = "Time out!"
-        elif not (moves := self.get_moves()):
+        elif not self.legal_moves():
             if all(piece.color == 1 for piece in self.pieces):
                 msg = "Horde was destroyed"
             else:
-                msg = "Stalemate"
-        elif not self.filter_checks(moves):
-            msg = "Checkmate"
+                msg = "Checkmate" if self.is_check() else "Stalemate"
         elif self.half_moves >= 100:
             msg = "Draw by 50 move rule"
-        elif 3 in std.Counter(self.move_fen).values():
+        elif self.is_repetition():
             msg = "Threefold repetition"
         elif self.is_insufficient_material()[2]:
             msg = "Insufficient material"
@@ -210,10 +194,10 @@ class Board(std.Board):
         if len(white) <= 1:
             wins = True
         else:
-            color = ord(white[0].pos[0]) %2 == int(white[0].pos[1]) %2
+            color = (white[0].pos & 7) %2 == (white[0].pos >> 3) %2
             for piece in white:
                 if piece.type == "B":
-                    if color is (ord(piece.pos[0]) %2 == int(piece.pos[1]) %2):
+                    if color is ((piece.pos & 7) %2 == (piece.pos >> 3) %2):
                         wins = True
                     else:
                         wins = False
@@ -225,10 +209,10 @@ class Board(std.Board):
         if len(black) <= 1:
             bins = True
         else:
-            color = ord(black[0].pos[0]) %2 == int(black[0].pos[1]) %2
+            color = (black[0].pos & 7) %2 == (black[0].pos >> 3) %2
             for piece in black:
                 if piece.type == "B":
-                    if color is (ord(piece.pos[0]) %2 == int(piece.pos[1]) %2):
+                    if color is ((piece.pos & 7) %2 == (piece.pos >> 3) %2):
                         wins = True
                     else:
                         wins = False
@@ -247,8 +231,8 @@ class Board(std.Board):
             elif all(p.type == "B" for p in white) and all(p.type == "B" for p in black):
                 draw = True
                 for b, w in zip(black, white):
-                    bcolor = (ord(w.pos[0]) %2 == int(w.pos[1]) %2)
-                    wcolor = (ord(b.pos[0]) %2 == int(b.pos[1]) %2)
+                    bcolor = ((w.pos & 7) %2 == (w.pos >> 3) %2)
+                    wcolor = ((b.pos & 7) %2 == (b.pos >> 3) %2)
                     if wcolor is not bcolor:
                         draw = False
                         break
@@ -258,20 +242,3 @@ class Board(std.Board):
         elif bb:
             return False if wb else wins, False, False
         return wins, bins, draw
-
-    def castling(self) -> str:
-        """Returns the castling rights for FEN generation"""
-        king = False
-        queen = False
-        if self.king.moved:
-            return "-"
-
-        for piece in self.pieces:
-            if piece.type == "R" and not piece.moved:
-                if piece.color:
-                    if piece.pos[0] > self.king.pos[0] and self.king.k and king is not None:
-                        king = "k"
-                    elif self.king.q and queen is not None:
-                        queen = "q"
-
-        return "".join(list(filter(None, (king, queen)))) or "-"
@@ -1,6 +1,12 @@
 """Contains the code for the King of the Hill variant"""
 
 from chess import standard as std
+from chess.bitboard import SQUARES, BB_SQUARES
+from chess.evaluation import KING_OF_THE_HILL_TABLES
+
+
+CENTER = (SQUARES["e4"], SQUARES["d4"], SQUARES["e5"], SQUARES["d5"])
+BB_CENTER = sum(BB_SQUARES[square] for square in CENTER)
 
 
 class Board(std.Board):
@@ -10,22 +16,29 @@ class Board(std.Board):
         fen (str, optional): starting FEN. Defaults to the standard starting FEN.
         format_ (str, optional): Time format. Defaults to "5+0".
     """
+    __slots__ = ()
+    piece_square_tables = KING_OF_THE_HILL_TABLES
+
+    def variant_outcome(self) -> int|None:
+        """Checks if the rules have decided the game. A king reaching the centre wins."""
+        if self.bitboards["K"][not self.turn] & BB_CENTER:
+            return -1
+        return None
+
     def is_over(self) -> None:
         """Ends the game if the game is over"""
         msg = ""
         if self.clock.is_up():
             msg = "Time out!"
-        elif self.wking.pos in ('e4', 'd4', 'e5', 'd5'):
+        elif self.wking.pos in CENTER:
             msg = "King of the Hill, white won"
-        elif self.bking.pos in ('e4', 'd4', 'e5', 'd5'):
+        elif self.bking.pos in CENTER:
             msg = "King of the Hill, black won"
-        elif not (moves := self.get_moves()):
-            msg = "Stalemate"
-        elif not self.filter_checks(moves):
-            msg = "Checkmate"
+        elif not self.legal_moves():
+            msg = "Checkmate" if self.is_check() else "Stalemate"
         elif self.half_moves >= 100:
             msg = "Draw by 50 move rule"
-        elif 3 in std.Counter(self.move_fen).values():
+        elif self.is_repetition():
             msg = "Threefold repetition"
         if msg:
             self.clock.stop()
@@ -1,6 +1,7 @@
 """Contains the code for the No Castling variant"""
 
 from chess import standard as std
+from chess.bitboard import SQUARES
 
 
 class King(std.King):
@@ -8,22 +9,12 @@ class King(std.King):
 
     Args:
         color (int): color of the piece
-        position (tuple[int, int]): Position of the piece in a numeric form.
+        pos (int): index of the square of the piece
     """
+    __slots__ = ()
 
-    def can_move(self, move:str) -> bool:
-        return self.can_capture(move)
-
-    def get_moves(self) -> list[str]:
-        moves = []
-        for i in (1, 0, -1):
-            for j in (1, 0, -1):
-                if i == j == 0:
-                    continue
-                square = f"{chr(ord(self.pos[0]) + i)}{int(self.pos[1]) + j}"
-                if std.check_UCI(self.pos+square) and self.can_move(square):
-                    moves.append(square)
-        return moves
+    def get_moves(self) -> list[std.Move]:
+        return self.get_step_moves()
 
 
 class Board(std.Board):
@@ -33,6 +24,7 @@ class Board(std.Board):
         fen (str, optional): starting FEN. Defaults to the standard starting FEN.
         format_ (str, optional): Time format. Defaults to "5+0".
     """
+    __slots__ = ()
     starting_fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - 0 1"
 
     def make_board(self, fen:str) -> None:
@@ -44,16 +36,14 @@ class Board(std.Board):
         Raises:
             ValueError: if the fen is invalid
         """
-        self.pieces:list[std.Piece] = []
-        self.wking:King = None
-        self.bking:King = None
-        self.board = [[std.Square((i, j)) for i in range(8)] for j in range(8)]
+        self.clear()
         parts = fen.split()
         self.turn = 0 if parts[1] == "w" else 1
-        self.en_passant = None if parts[2] == "-" else parts[2]
+        self.en_passant = None if parts[2] == "-" else SQUARES[parts[2]]
         self.half_moves = int(parts[3])
         self.full_moves = int(parts[4])
         self.make_pieces(parts[0])
+        self.zobrist = self.zobrist_hash()
 
     def make_pieces(self, pieces:str) -> None:
         """Makes the board
@@ -72,34 +62,34 @@ class Board(std.Board):
                     continue
                 match square:
                     case "r":
-                        piece = std.Rook(1, current[::-1])
+                        piece = std.Rook(1, current[0]*8 + current[1])
                     case "n":
-                        piece = std.Knight(1, current[::-1])
+                        piece = std.Knight(1, current[0]*8 + current[1])
                     case "b":
-                        piece = std.Bishop(1, current[::-1])
+                        piece = std.Bishop(1, current[0]*8 + current[1])
                     case "q":
-                        piece = std.Queen(1, current[::-1])
+                        piece = std.Queen(1, current[0]*8 + current[1])
                     case "p":
-                        piece = std.Pawn(1, current[::-1])
+                        piece = std.Pawn(1, current[0]*8 + current[1])
                     case "R":
-                        piece = std.Rook(0, current[::-1])
+                        piece = std.Rook(0, current[0]*8 + current[1])
                     case "N":
-                        piece = std.Knight(0, current[::-1])
+                        piece = std.Knight(0, current[0]*8 + current[1])
                     case "B":
-                        piece = std.Bishop(0, current[::-1])
+                        piece = std.Bishop(0, current[0]*8 + current[1])
                     case "Q":
-                        piece = std.Queen(0, current[::-1])
+                        piece = std.Queen(0, current[0]*8 + current[1])
                     case "P":
-                        piece = std.Pawn(0, current[::-1])
+                        piece = std.Pawn(0, current[0]*8 + current[1])
                     case "k":
                         if self.bking:
                             raise ValueError("More than 1 Black King")
-                        piece = King(1, current[::-1])
+                        piece = King(1, current[0]*8 + current[1])
                         self.bking = piece
                     case "K":
                         if self.wking:
                             raise ValueError("More than 1 White King")
-                        piece = King(0, current[::-1])
+                        piece = King(0, current[0]*8 + current[1])
                         self.wking = piece
                     case _:
                         raise ValueError("Illegal FEN")
@@ -115,5 +105,5 @@ class Board(std.Board):
     def generate_fen(self) -> str:
         """Genrates FEN for given board"""
         fen = f"{self.generate_piece_fen()} {'b' if self.turn else 'w'}"
-        fen += f" {self.en_passant or '-'} {self.half_moves} {self.full_moves}"
+        fen += f" {self.en_passant_fen()} {self.half_moves} {self.full_moves}"
         return fen
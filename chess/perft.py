@@ -0,0 +1,270 @@
+"""Contains the perft command and the reference positions used to test and benchmark
+move generation
+
+Run the whole suite with ``python -m chess.perft`` or a single position with
+``python -m chess.perft --variant Horde --fen "<fen>" --depth 3 --divide``. Add
+``--workers 0`` to spread the work over every core.
+"""
+
+import json
+import platform
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import NamedTuple
+import chess
+from chess import standard as std
+
+
+VARIANTS:dict[str, type[std.Board]] = {
+    "Standard": chess.Standard, "Chess960": chess.Chess960, "ThreeCheck": chess.ThreeCheck,
+    "NoCastling": chess.NoCastling, "Torpedo": chess.Torpedo, "AntiChess": chess.AntiChess,
+    "KingOfTheHill": chess.KingOfTheHill, "RacingKings": chess.RacingKings,
+    "Horde": chess.Horde, "CrazyHouse": chess.CrazyHouse}
+
+
+class Position(NamedTuple):
+    """A reference position
+
+    Args:
+        variant (str): Name of the board class in VARIANTS
+        fen (str): FEN of the position, in the format of the variant
+        nodes (tuple[int, ...]): Expected perft results from depth 1 on
+    """
+    variant:str
+    fen:str
+    nodes:tuple[int, ...]
+
+
+# Checked against python-chess, except Torpedo and No Castling which were checked
+# against the per piece move generators
+POSITIONS = (
+    Position("Standard", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+             (20, 400, 8902, 197281)),
+    Position("Standard", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+             (48, 2039, 97862)),
+    Position("Standard", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", (14, 191, 2812, 43238)),
+    Position("Standard", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+             (6, 264, 9467)),
+    Position("Standard", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+             (44, 1486, 62379)),
+    Position("Chess960", "bqnb1rkr/pp3ppp/3ppn2/2p5/5P2/P2P4/NPP1P1PP/BQ1BNRKR w HFhf - 2 9",
+             (21, 528, 12189)),
+    Position("Chess960", "2nnrbkr/p1qppppp/8/1ppb4/6PP/3PP3/PPP2P2/BQNNRBKR w HEhe - 1 9",
+             (21, 807, 18002)),
+    Position("Chess960", "qbbnnrkr/2pp2pp/p7/1p2pp2/8/P3PP2/1PPP1KPP/QBBNNR1R w hf - 0 9",
+             (22, 593, 13440)),
+    Position("ThreeCheck", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1 +0+0",
+             (20, 400, 8902)),
+    Position("ThreeCheck", "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 2 4 +0+0",
+             (42, 1232, 49147)),
+    Position("NoCastling", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - 0 1",
+             (20, 400, 8902)),
+    Position("NoCastling", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w - 0 1",
+             (46, 1866, 86677)),
+    Position("Torpedo", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+             (20, 400, 9194)),
+    Position("Torpedo", "rnbqkbnr/pp3ppp/8/2ppp3/4P3/2N5/PPPP1PPP/R1BQKBNR w KQkq - 0 4",
+             (32, 1177, 37926)),
+    Position("Torpedo", "4k3/8/2p5/8/1P6/3P4/8/4K3 w - - 0 1", (9, 66, 690, 5645)),
+    Position("AntiChess", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - 0 1", (20, 400, 8067)),
+    Position("AntiChess", "8/1p6/8/8/8/8/P7/8 w - 0 1", (2, 4, 4, 3, 1)),
+    Position("AntiChess", "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w - 0 2",
+             (29, 644, 10484)),
+    Position("KingOfTheHill", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+             (20, 400, 8902)),
+    Position("KingOfTheHill", "rnbq1bnr/ppp2ppp/3pk3/4p3/2P1P3/8/PP1P1PPP/RNBQKBNR w KQ - 0 4",
+             (28, 812, 23458)),
+    Position("RacingKings", "8/8/8/8/8/8/krbnNBRK/qrbnNBRQ w - - 0 1", (21, 421, 11264)),
+    Position("RacingKings", "4brn1/2K2k2/8/8/8/8/8/8 w - - 0 1", (6, 33, 178, 3151)),
+    Position("Horde", "rnbqkbnr/pppppppp/8/1PP2PP1/PPPPPPPP/PPPPPPPP/PPPPPPPP/PPPPPPPP w kq - 0 1",
+             (8, 128, 1274, 23310)),
+    Position("Horde", "4k3/pp4q1/3P2p1/8/P3PP2/PPP2r2/PPP5/PPPP4 b - - 0 1", (30, 241, 6633)),
+    Position("CrazyHouse", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR/ w KQkq - 0 1",
+             (20, 400, 8902)),
+    Position("CrazyHouse", "2k5/8/8/8/8/8/8/4K3/QRBNPqrbnp w - - 0 1", (301, 75353)),
+    Position("CrazyHouse", "r1bqk2r/pppp1ppp/2n1p3/4P3/1b1Pn3/2NB1N2/PPP2PPP/R1BQK2R/ b KQkq - 0 1",
+             (42, 1347)),
+)
+
+
+def _perft_task(variant:str, fen:str, moves:tuple[str, ...], depth:int) -> int:
+    """Rebuilds the position from the FEN and the moves played since, then runs perft.
+    Runs in the worker processes of parallel_perft_divide.
+    """
+    board = VARIANTS[variant](fen)
+    for move in moves:
+        board.push(board.parse_uci(move))
+    return board.perft(depth)
+
+
+def parallel_perft_divide(variant:str, fen:str, depth:int, workers:int|None=None,
+                          split_depth:int=1) -> dict[str, int]:
+    """Runs perft_divide with the subtrees spread over a pool of processes. Each worker
+    rebuilds its position from the FEN, since boards are not sent between processes.
+
+    Args:
+        variant (str): Name of the board class in VARIANTS
+        fen (str): FEN of the position
+        depth (int): Number of half moves, including the first one
+        workers (int|None, optional): Number of processes. Defaults to one per core.
+        split_depth (int, optional): 1 to give each root move its own task, 2 to give
+        each reply to a root move its own task, which balances the load better.
+        Defaults to 1.
+
+    Raises:
+        ValueError: If the split depth is not 1 or 2
+
+    Returns:
+        dict[str, int]: The nodes for each root move, in UCI notation
+    """
+    if split_depth not in (1, 2):
+        raise ValueError("The split depth has to be 1 or 2")
+    board = VARIANTS[variant](fen)
+    split_depth = min(split_depth, depth - 1)
+    if split_depth < 1:
+        return board.perft_divide(depth)
+
+    nodes = {}
+    tasks = []
+    for move in list(board.generate_legal_moves()):
+        nodes[move.uci()] = 0
+        if split_depth == 1:
+            tasks.append((move.uci(), (move.uci(),)))
+            continue
+        board.push(move)
+        for reply in list(board.generate_legal_moves()):
+            tasks.append((move.uci(), (move.uci(), reply.uci())))
+        board.pop()
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [(root, executor.submit(_perft_task, variant, fen, moves, depth - len(moves)))
+                   for root, moves in tasks]
+        for root, future in futures:
+            nodes[root] += future.result()
+    return nodes
+
+
+def run(variant:str, fen:str, depth:int, workers:int=1,
+        split_depth:int=1) -> tuple[int, float]:
+    """Runs perft on the position. Perft calls the move generator directly and skips
+    the move cache
+
+    Args:
+        variant (str): Name of the board class in VARIANTS
+        fen (str): FEN of the position
+        depth (int): Number of half moves
+        workers (int, optional): Number of processes, 0 for one per core. Defaults to 1.
+        split_depth (int, optional): Depth the work is split at between processes.
+        Defaults to 1.
+
+    Returns:
+        tuple[int, float]: Number of nodes and the seconds it took
+    """
+    if workers != 1:
+        start = perf_counter()
+        nodes = parallel_perft_divide(variant, fen, depth, workers or None, split_depth)
+        return sum(nodes.values()), perf_counter() - start
+    board = VARIANTS[variant](fen)
+    start = perf_counter()
+    nodes = board.perft(depth)
+    return nodes, perf_counter() - start
+
+
+def run_suite(max_depth:int|None=None, variants:list[str]|None=None, workers:int=1,
+              split_depth:int=1) -> dict:
+    """Runs perft on the reference positions and checks the results
+
+    Args:
+        max_depth (int|None, optional): Deepest depth to run. Defaults to the deepest
+        known result of each position.
+        variants (list[str]|None, optional): Variants to run. Defaults to all of them.
+        workers (int, optional): Number of processes, 0 for one per core. Defaults to 1.
+        split_depth (int, optional): Depth the work is split at between processes.
+        Defaults to 1.
+
+    Returns:
+        dict: The report, with the results of every position and the overall speed
+    """
+    results = []
+    for position in POSITIONS:
+        if variants and position.variant not in variants:
+            continue
+        depth = min(len(position.nodes), max_depth or len(position.nodes))
+        nodes, seconds = run(position.variant, position.fen, depth, workers, split_depth)
+        expected = position.nodes[depth - 1]
+        results.append({
+            "variant": position.variant, "fen": position.fen, "depth": depth, "nodes": nodes,
+            "expected": expected, "passed": nodes == expected, "seconds": round(seconds, 4),
+            "nps": int(nodes / seconds) if seconds else 0})
+    nodes = sum(result["nodes"] for result in results)
+    seconds = sum(result["seconds"] for result in results)
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "workers": workers,
+        "passed": all(result["passed"] for result in results),
+        "nodes": nodes,
+        "seconds": round(seconds, 4),
+        "nps": int(nodes / seconds) if seconds else 0,
+        "positions": results}
+
+
+def main(args:list[str]|None=None) -> int:
+    """Runs the perft command
+
+    Args:
+        args (list[str]|None, optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Exit status, 1 if a reference result did not match
+    """
+    parser = ArgumentParser(prog="python -m chess.perft",
+                            description="Counts move generation nodes to test and benchmark it")
+    parser.add_argument("--variant", choices=VARIANTS, help="Variant of the position or suite")
+    parser.add_argument("--fen", help="Position to run instead of the reference positions")
+    parser.add_argument("--depth", type=int, help="Depth to run, or the deepest depth of the suite")
+    parser.add_argument("--divide", action="store_true", help="Show the nodes under each move")
+    parser.add_argument("--json", default="perft.json", help="File the suite report is written to")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes, 0 for one per core")
+    parser.add_argument("--split", type=int, choices=(1, 2), default=1,
+                        help="Give each root move (1) or each reply (2) its own process task")
+    options = parser.parse_args(args)
+
+    if options.fen:
+        variant = options.variant or "Standard"
+        depth = options.depth or 1
+        if options.divide:
+            start = perf_counter()
+            if options.workers != 1:
+                divide = parallel_perft_divide(variant, options.fen, depth,
+                                               options.workers or None, options.split)
+            else:
+                divide = VARIANTS[variant](options.fen).perft_divide(depth)
+            seconds = perf_counter() - start
+            for move, nodes in sorted(divide.items()):
+                print(move, nodes)
+            nodes = sum(divide.values())
+        else:
+            nodes, seconds = run(variant, options.fen, depth, options.workers, options.split)
+        print(f"{nodes} nodes in {seconds:.3f}s ({int(nodes / seconds) if seconds else 0} nps)")
+        return 0
+
+    report = run_suite(options.depth, [options.variant] if options.variant else None,
+                       options.workers, options.split)
+    for result in report["positions"]:
+        status = "ok  " if result["passed"] else "FAIL"
+        print(f"{status} {result['variant']:<14} depth {result['depth']} {result['nodes']:>8}"
+              f" {result['nps']:>8} nps  {result['fen']}")
+        if not result["passed"]:
+            print(f"     expected {result['expected']}")
+    print(f"{report['nodes']} nodes in {report['seconds']:.3f}s ({report['nps']} nps)")
+    with open(options.json, "w") as file:
+        json.dump(report, file, indent=4)
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,9 @@
 """Contains the code for Racing Kings variant"""
 
+from typing import Iterator
 from chess import standard as std
+from chess.bitboard import BB_RANKS, BB_KING_ATTACKS, scan
+from chess.evaluation import RACING_KINGS_TABLES
 
 
 class Board(std.Board):
@@ -10,34 +13,62 @@ class Board(std.Board):
         fen (str, optional): starting FEN. Defaults to the standard starting FEN.
         format_ (str, optional): Time format. Defaults to "5+0".
     """
-
+    __slots__ = ("end",)
     starting_fen = "8/8/8/8/8/8/krbnNBRK/qrbnNBRQ w - - 0 1"
+    piece_square_tables = RACING_KINGS_TABLES
 
     def __init__(self, fen:str="", format_:str="5+0") -> None:
         super().__init__(fen, format_)
         self.end = None
 
-    def filter_checks(self, moves:list[str]) -> list[str]:
-        """Filters the moves to remove checks
+    def generate_legal_moves(self) -> Iterator[std.Move]:
+        """Generates the legal moves. Giving check is not allowed either and there are
+        no moves once the race is over.
+        """
+        if self.is_race_over():
+            return
+        for move in super().generate_legal_moves():
+            self.push(move)
+            check = self.is_check()
+            self.pop()
+            if not check:
+                yield move
+
+    def generate_legal_captures(self, checks:bool=False) -> Iterator[std.Move]:
+        """Generates the legal captures. There are no pawns and checks are not allowed."""
+        if self.is_race_over():
+            return
+        for move in super().generate_legal_captures():
+            self.push(move)
+            check = self.is_check()
+            self.pop()
+            if not check:
+                yield move
 
-        Args:
-            moves (list[str]): List of moves
+    def is_race_over(self) -> bool:
+        """Checks if a king has reached the last rank. When the white king got there
+        first, black still gets a move if its king can reach the last rank as well.
+        """
+        kings = self.bitboards["K"]
+        if not (kings[0] | kings[1]) & BB_RANKS[7]:
+            return False
+        if self.turn == 0 or kings[1] & BB_RANKS[7] or not kings[1]:
+            return True
+        targets = BB_KING_ATTACKS[kings[1].bit_length() - 1] & BB_RANKS[7] & ~self.occupied[1]
+        return all(self.is_attacked_by(0, target) for target in scan(targets))
 
-        Returns:
-            list[str]: Filtered list of moves
+    def variant_outcome(self) -> int|None:
+        """Checks if the rules have decided the game. The first king on the last rank wins,
+        or both draw.
         """
-        if self.filter_moves:
-            if self.filter_moves[0] == [self.turn, self.full_moves]:
-                return self.filter_moves[1]
-        filtered = []
-        for move in moves:
-            self._old_play(move)
-            if not (std.Square[self.wking.pos].is_attacked() 
-                    or std.Square[self.bking.pos].is_attacked()):
-                filtered.append(move)
-            self.reverse()
-        self.filter_moves = [[self.turn, self.full_moves], filtered]
-        return filtered
+        if not self.is_race_over():
+            return None
+        kings = self.bitboards["K"]
+        mine = kings[self.turn] & BB_RANKS[7]
+        theirs = kings[not self.turn] & BB_RANKS[7]
+        if mine and theirs:
+            return 0
+        return 1 if mine else -1
 
     def is_over(self) -> None:
         """Ends the game if the game is over"""
@@ -45,30 +76,30 @@ class Board(std.Board):
         if self.clock.is_up():
             msg = "Time out!"
 
-        elif self.wking.pos[1] == "8":
-            if self.bking.pos[1] == "8":
+        elif self.wking.pos >> 3 == 7:
+            if self.bking.pos >> 3 == 7:
                 msg = "Race is drawn"
             elif self.end == 1:
                 msg = "white won the race"
-            elif any(p[1] == "8" for p in self.bking.get_moves()):
+            elif any(move.to_square >> 3 == 7 for move in self.bking.get_moves()):
                 self.end = 1
             else:
                 msg = "white won the race"
 
-        elif self.bking.pos[1] == "8":
-            if self.wking.pos[1] == "8":
+        elif self.bking.pos >> 3 == 7:
+            if self.wking.pos >> 3 == 7:
                 msg = "Race is drawn"
             elif self.end == 0:
                 msg = "black won the race"
-            elif any(p[1] == "8" for p in self.wking.get_moves()):
+            elif any(move.to_square >> 3 == 7 for move in self.wking.get_moves()):
                 self.end = 0
             else:
                 msg = "black won the race"
-        elif not self.get_moves():
+        elif not self.legal_moves():
             msg = "Stalemate"
         elif self.half_moves >= 100:
             msg = "Draw by 50 move rule"
-        elif 3 in std.Counter(self.move_fen).values():
+        elif self.is_repetition():
             msg = "Threefold repetition"
         if msg:
             self.clock.stop()
@@ -2,12 +2,56 @@ from __future__ import annotations
 
 """Contains the Board for standard, chess960 and from-position variants"""
 
+import re
 from pprint import PrettyPrinter
-from collections import Counter
+from collections import OrderedDict
 from itertools import permutations
 from abc import ABC, abstractmethod
 from threading import Thread
 from time import sleep
+from typing import Iterator, NamedTuple
+from chess.bitboard import (BB_ALL, BB_SQUARES, BB_RANKS, SQUARES, SQUARE_NAMES, scan, between,
+    BB_KNIGHT_ATTACKS, BB_KING_ATTACKS, BB_PAWN_ATTACKS, rook_attacks, bishop_attacks,
+    queen_attacks, rook_xray_attacks, bishop_xray_attacks)
+from chess.zobrist import ZOBRIST_PIECES, ZOBRIST_TURN, ZOBRIST_CASTLING, ZOBRIST_EN_PASSANT
+from chess.evaluation import STANDARD_TABLES, SEE_VALUES
+
+
+# Piece, file and rank of the moving piece, destination and promotion of a SAN move
+SAN_REGEX = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQKnbrqk]))?$")
+# Piece and square of a drop, like "N@e4"
+SAN_DROP_REGEX = re.compile(r"^([NBRQP])?@([a-h][1-8])$")
+
+
+class Move(NamedTuple):
+    """A move, packed as square indices
+
+    Args:
+        from_square (int): Square the piece moves from, the drop square for drops
+        to_square (int): Square the piece moves to
+        promotion (str, optional): Piece letter promoted to, or the piece dropped.
+        Defaults to "".
+        flags (int, optional): Special move flags. Defaults to 0.
+    """
+    from_square:int
+    to_square:int
+    promotion:str = ""
+    flags:int = 0
+
+    # flags
+    DOUBLE_PUSH = 1
+    EN_PASSANT = 2
+    CASTLING = 4
+    DROP = 8
+
+    def __str__(self) -> str:
+        return self.uci()
+
+    def uci(self) -> str:
+        """Returns the move in UCI notation. Drops are written like "@Ne4"."""
+        if self.flags & Move.DROP:
+            return f"@{self.promotion}{SQUARE_NAMES[self.to_square]}"
+        return SQUARE_NAMES[self.from_square] + SQUARE_NAMES[self.to_square] + self.promotion
 
 
 class Piece(ABC):
@@ -15,119 +59,66 @@ class Piece(ABC):
 
     Args:
         color (int): Color of the piece (0 for white, 1 for black)
-        pos (str): position of the piece
+        pos (int): index of the square of the piece
     """
 
+    __slots__ = ("pos", "color", "type", "board", "promoted")
     type_:str = ""
-    board:Board = None
 
-    def __init__(self, color:int, pos:tuple[int, int]) -> None:
-        self.pos = f"{chr(pos[0]+97)}{pos[1]+1}"
+    def __init__(self, color:int, pos:int) -> None:
+        self.pos = pos
         self.color = color  # 0(white) or 1(black)
-        self.numpos = pos
         self.type:str = self.type_
+        # Set once the piece is placed on a square
+        self.board:Board = None
+        # Promoted pieces turn back into pawns when captured in crazyhouse
+        self.promoted = False
 
     def __str__(self) -> str:
         if self.color:
             return self.type.lower()
         return self.type.upper()
 
-    @abstractmethod
-    def move(self, move:str) -> None:
+    def move(self, square:int, promotion:str="") -> None:
         """Moves the piece to the given square
 
         Args:
-            move (str): destination square
-        
-        Raises:
-            ValueError: If the square passed is not valid
-        """
+            square (int): destination square
+            promotion (str, optional): piece to promote to. Defaults to "".
 
-    @abstractmethod
-    def can_move(self, move:str) -> bool:
-        """Checks if the piece can move to the given square
-
-        Args:
-            move (str): The square
-
-        Returns:
-            bool: If the piece can move to that square
+        Raises:
+            IllegalMoveError: If the piece cannot move to that square
         """
+        for move in self.board.legal_moves():
+            if move[:3] == (self.pos, square, promotion):
+                self.board.push(move)
+                return
+        raise IllegalMoveError(self, SQUARE_NAMES[square])
 
     @abstractmethod
-    def get_moves(self) -> list[str]:
+    def get_moves(self) -> list[Move]:
         """Gets a list of all the moves for the pieces
 
         Returns:
-            list[str]: list of all of the piece's moves
-        """
-
-    def can_move_diagonally(self, move:str, one:bool=False, dir_:bool|None=None) -> bool:
-        """Checks if the piece can move diagonally to the given square
-
-        Args:
-            move (str): The square
-            one (bool): if the piece can only move 1 square. Defaults to False.
-            dir_ (bool|None): if the piece can only move forward 1 square in the given 
-            direction. Defaults to False.
-
-        Returns:
-            bool: If the piece can move diagonally to that square
+            list[Move]: list of all of the piece's moves
         """
 
-        cond = abs(ord(self.pos[0]) - ord(move[0])) == abs(int(self.pos[1]) - int(move[1]))
-        if not cond or self.is_occupied(move):
-            return False
-        if dir_ is not None:
-            if not abs(ord(self.pos[0]) - ord(move[0])) == 1:
-                return False
-            return int(move[1]) - int(self.pos[1]) == (1 if dir_ else  -1)
-        if one:
-            return abs(ord(self.pos[0]) - ord(move[0])) == 1
-        stepy = abs(int(move[1]) - int(self.pos[1]))//(int(move[1]) - int(self.pos[1]))
-        stepx = abs(ord(move[0]) - ord(self.pos[0]))//(ord(move[0]) - ord(self.pos[0]))
-        sq = chr(ord(self.pos[0]) + stepx) + str(int(self.pos[1]) + stepy)
-        while sq != move:
-            if sq[0] == "i" or sq[1] in "09":
-                break
-            if Piece.board[sq].piece is not None:
-                return False
-            sq = chr(ord(sq[0]) + stepx) + str(int(sq[1]) + stepy)
-        return True
-
-    def can_move_straight(self, move:str, one:bool=False) -> bool:
-        """Checks if the piece can move straight to the given square
+    def can_move(self, square:int) -> bool:
+        """Checks if the piece can move to the given square
 
         Args:
-            move (str): The square
-            one (bool): if the piece can only move 1 square. Defaults to False.
+            square (int): The square
 
         Returns:
-            bool: If the piece can move straight to that square
+            bool: If the piece can move to that square
         """
+        return any(move.to_square == square for move in self.get_moves())
 
-        cond = (move[0] == self.pos[0]) != (move[1] == self.pos[1])
-        if not cond or self.is_occupied(move):
-            return False
-        if one:
-            cond_a =  abs(ord(self.pos[0]) - ord(move[0])) == 1
-            cond_b = abs(int(self.pos[1]) - int(move[1])) == 1
-            return cond_a or cond_b
-        if move[1] == self.pos[1]:
-            step = abs(ord(move[0]) - ord(self.pos[0]))//(ord(move[0]) - ord(self.pos[0]))
-            return not any(Piece.board[f'{chr(file)}{move[1]}'].piece is not None
-                for file in range(ord(self.pos[0])+step, ord(move[0]), step))
-        if move[0] == self.pos[0]:
-            step = abs(ord(move[1]) - ord(self.pos[1]))//(ord(move[1]) - ord(self.pos[1]))
-            return all(Piece.board[f'{move[0]}{rank}'].piece is None
-                for rank in range(int(self.pos[1])+step, int(move[1]), step))
-        return False
-
-    def is_occupied(self, square:str, opponent:bool=False, both:bool=False) -> bool:
+    def is_occupied(self, square:int, opponent:bool=False, both:bool=False) -> bool:
         """Checks if the square is occupied by another of your own piece
 
         Args:
-            move (str): The square
+            square (int): The square
             opponent (bool): returns True if square is occupied by an opponent piece.
             Defaults to False.
             both (bool): returns if the square is occupied by any piece. Defaults to False.
@@ -136,75 +127,42 @@ class Piece(ABC):
             bool: If the square is occupied
         """
 
-        piece = Piece.board[square].piece
+        mask = BB_SQUARES[square]
+        occupied = self.board.occupied
         if opponent:
-            return piece and piece.color != self.color
+            return bool(occupied[not self.color] & mask)
         if both:
-            return bool(piece)
-        return piece and piece.color == self.color
+            return bool((occupied[0] | occupied[1]) & mask)
+        return bool(occupied[self.color] & mask)
 
     def delete(self) -> None:
         """Deletes the piece"""
-        del Piece.board[self.pos]
-        Piece.board.pieces.remove(self)
+        del self.board[self.pos]
+        self.board.pieces.remove(self)
 
-    def get_diagonal_moves(self) -> list[str]:
+    def get_diagonal_moves(self) -> list[Move]:
         """Gets all of the piece's diagonal moves
 
         Returns:
-            list[str]: a list of all of the piece's diagonal moves'
+            list[Move]: a list of all of the piece's diagonal moves'
         """
-        moves = []
-        m = chr(ord(self.pos[0])+1)+str(int(self.pos[1])+1)
-        while check_UCI(self.pos+m) and self.can_move(m):
-            moves.append(m)
-            m = chr(ord(m[0])+1)+str(int(m[1])+1)
-        m = chr(ord(self.pos[0])-1)+str(int(self.pos[1])-1)
-        while check_UCI(self.pos+m) and self.can_move(m):
-            moves.append(m)
-            m = chr(ord(m[0])-1)+str(int(m[1])-1)
-        m = chr(ord(self.pos[0])-1)+str(int(self.pos[1])+1)
-        while check_UCI(self.pos+m) and self.can_move(m):
-            moves.append(m)
-            m = chr(ord(m[0])-1)+str(int(m[1])+1)
-        m = chr(ord(self.pos[0])+1)+str(int(self.pos[1])-1)
-        while check_UCI(self.pos+m) and self.can_move(m):
-            moves.append(m)
-            m = chr(ord(m[0])+1)+str(int(m[1])-1)
-        return moves
+        board = self.board
+        attacks = bishop_attacks(self.pos, board.occupied[0] | board.occupied[1])
+        return [Move(self.pos, square) for square in scan(attacks & ~board.occupied[self.color])]
 
-    def get_straight_moves(self) -> list[str]:
+    def get_straight_moves(self) -> list[Move]:
         """Gets all of the piece's straight moves
 
         Returns:
-            list[str]: a list of all of the piece's straight moves'
+            list[Move]: a list of all of the piece's straight moves'
         """
-        moves = []
-        m = chr(ord(self.pos[0])+1)
-        while check_UCI(self.pos+m+self.pos[1]) and self.can_move(m+self.pos[1]):
-            moves.append(m+self.pos[1])
-            m = chr(ord(m)+1)
-        m = chr(ord(self.pos[0])-1)
-        while check_UCI(self.pos+m+self.pos[1]) and self.can_move(m+self.pos[1]):
-            moves.append(m+self.pos[1])
-            m = chr(ord(m)-1)
-        m = str(int(self.pos[1])+1)
-        while check_UCI(self.pos+self.pos[0]+m) and self.can_move(self.pos[0]+m):
-            moves.append(self.pos[0]+m)
-            m = str(int(m)+1)
-        m = str(int(self.pos[1])-1)
-        while check_UCI(self.pos+self.pos[0]+m) and self.can_move(self.pos[0]+m):
-            moves.append(self.pos[0]+m)
-            m = str(int(m)-1)
-        return moves
-
-    def can_capture(self, move:str) -> bool:
-        return self.can_move(move)
+        board = self.board
+        attacks = rook_attacks(self.pos, board.occupied[0] | board.occupied[1])
+        return [Move(self.pos, square) for square in scan(attacks & ~board.occupied[self.color])]
 
     @classmethod
     def make_piece(cls, color:int , pos:str) -> Piece:
-        pos = ord(pos[0])-97, int(pos[1])-1
-        return cls(color, pos)
+        return cls(color, SQUARES[pos])
 
 
 class IllegalMoveError(Exception):
@@ -213,7 +171,7 @@ class IllegalMoveError(Exception):
         if msg:
             super().__init__(msg)
         else:
-            super().__init__(f"{piece} at {piece.pos} cannot play {move}")
+            super().__init__(f"{piece} at {SQUARE_NAMES[piece.pos]} cannot play {move}")
 
 
 class King(Piece):
@@ -221,82 +179,22 @@ class King(Piece):
 
     Args:
         color (int): color of the piece
-        position (tuple[int, int]): Position of the piece in a numeric form.
+        pos (int): index of the square of the piece
     """
+    __slots__ = ()
     type_ = "K"
-    CASTLING = ("g1", "g8", "c1", "c8")
-    CASTLED_ROOK = ("f1", "f8", "d1", "d8")
+    CASTLING = (SQUARES["g1"], SQUARES["g8"], SQUARES["c1"], SQUARES["c8"])
+    CASTLED_ROOK = (SQUARES["f1"], SQUARES["f8"], SQUARES["d1"], SQUARES["d8"])
 
-    def __init__(self, color:int, position:tuple[int, int]) -> None:
-        if (position[1] == 0 and not color) or (position[1] == 7 and color):
-            self.moved = False
-        else:
-            self.moved = True
-        self.k = not self.moved
-        self.q = not self.moved
-        super().__init__(color, position)
-
-    def move(self, move:str) -> None:
-        if not (castle := self.can_move(move)):
-            raise IllegalMoveError(self, move)
-        if isinstance(castle, Rook):
-            self.castle(castle)
-        elif self.is_occupied(move, True):
-            Piece.board.half_moves = 0
-            Piece.board[move].piece.delete()
-        del Piece.board[self.pos]
-        self.pos = move
-        Piece.board[move].piece = self
-        self.moved = True
-
-    def get_moves(self) -> list[str]:
-        moves = []
-        for i in (1, 0, -1):
-            for j in (1, 0, -1):
-                if i == j == 0:
-                    continue
-                square = f"{chr(ord(self.pos[0]) + i)}{int(self.pos[1]) + j}"
-                if check_UCI(self.pos+square) and self.can_move(square):
-                    moves.append(square)
-        castle = self.can_castle()
-        if castle[0]:
-            moves.append(self.CASTLING[1] if self.color else self.CASTLING[0])
-        if castle[1]:
-            moves.append(self.CASTLING[3] if self.color else self.CASTLING[2])
+    def get_moves(self) -> list[Move]:
+        moves = self.get_step_moves()
+        moves.extend(self.board.generate_castling_moves(self.color))
         return moves
 
-    def can_move(self, move:str) -> bool:
-        if len(move) == 2 and not self.is_occupied(move):
-            if self.can_move_straight(move, True) or self.can_move_diagonally(move, True):
-                return True
-            castle = self.can_castle()
-            if move in self.CASTLING[:2]:
-                return castle[0]
-            elif move in self.CASTLING[2:]:
-                return castle[1]
-
-    def can_capture(self, move:str) -> bool:
-        if len(move) == 2 and not self.is_occupied(move):
-            if self.can_move_straight(move, True) or self.can_move_diagonally(move, True):
-                return True
-        return False
-
-    def castle(self, piece:Rook) -> None:
-        """Castles the king"""
-        if hasattr(piece, "kingside"):
-            if self.color:
-                piece.move(self.CASTLED_ROOK[1])
-            else:
-                piece.move(self.CASTLED_ROOK[0])
-            delattr(piece, "kingside")
-        elif hasattr(piece, "queenside"):
-            if self.color:
-                piece.move(self.CASTLED_ROOK[3])
-            else:
-                piece.move(self.CASTLED_ROOK[2])
-            delattr(piece, "queenside")
-        else:
-            raise Exception(piece.__dict__)
+    def get_step_moves(self) -> list[Move]:
+        """Gets the king's one square moves, without castling"""
+        targets = BB_KING_ATTACKS[self.pos] & ~self.board.occupied[self.color]
+        return [Move(self.pos, square) for square in scan(targets)]
 
     def can_castle(self) -> tuple[None|Rook, None|Rook]:
         """Checks if the king can castle or not
@@ -306,51 +204,40 @@ class King(Piece):
         """
         kingside = None
         queenside = None
-        if self.moved or Square[self.pos].is_attacked():
+        board = self.board
+        if board.is_attacked_by(int(not self.color), self.pos):
             return None, None
-        for piece in self.board.pieces:
-            if piece.type == "R" and piece.color == self.color and not piece.moved:
-                if self.castle_route(piece.pos):
-                    if piece.pos[0] > self.pos[0] and self.k:
-                        kingside = piece
-                        piece.kingside = None
-                    elif self.q:
-                        queenside = piece
-                        piece.queenside = None
-
+        for square in scan(board.castling_rights & BB_RANKS[7 if self.color else 0]):
+            rook = board.squares[square].piece
+            if self.castle_route(rook.pos):
+                if rook.pos > self.pos:
+                    kingside = rook
+                else:
+                    queenside = rook
         return kingside, queenside
 
-    def castle_route(self, rook:Rook) -> bool:
+    def castle_route(self, rook:int) -> bool:
         """Checks if the path is clear and checkless for castling
 
         Args:
-            rook (int): Position of the rook with which the king will castle
+            rook (int): Square of the rook with which the king will castle
 
         Returns:
             bool: If the king can castle or not
         """
-
-        if rook[0] > self.pos[0] and self.k:
-            side = 0
-        elif self.q:
-            side = 2
-        else:
+        board = self.board
+        king = self.pos
+        side = 0 if rook > king else 2
+        king_to = self.CASTLING[self.color+side]
+        rook_to = self.CASTLED_ROOK[self.color+side]
+        walk = between(king, king_to) | BB_SQUARES[king_to]
+        path = walk | between(rook, rook_to) | BB_SQUARES[rook_to]
+        # The castling pieces themselves neither block the path nor shield the king
+        occupied = (board.occupied[0] | board.occupied[1]) & ~BB_SQUARES[king] & ~BB_SQUARES[rook]
+        if path & occupied:
             return False
-
-        far1 = ord(min(rook[0], self.pos[0],
-                self.CASTLING[self.color+side][0], self.CASTLED_ROOK[self.color+side][0]))
-        far2 = ord(max(rook[0], self.pos[0],
-                self.CASTLING[self.color+side][0], self.CASTLED_ROOK[self.color+side][0]))
-
-        for file in range(far1, far2):
-            if Square[chr(file)+self.pos[1]].piece is not None:
-                if chr(file) not in (rook[0], self.pos[0]):
-                        return False
-            if Square[f'{chr(file)}{self.pos[1]}'].is_attacked(self.color):
-                if (ord(self.pos[0]) <= file <= self.CASTLING[self.color+side]
-                    or ord(self.pos[0]) >= file >= self.CASTLING[self.color+side]):
-                    return False
-        return True
+        return not any(board.is_attacked_by(int(not self.color), square, occupied)
+                       for square in scan(walk))
 
 
 class Rook(Piece):
@@ -358,127 +245,56 @@ class Rook(Piece):
 
     Args:
         color (int): color of the piece
-        position (tuple[int, int]): Position of the piece in a numeric form.
+        pos (int): index of the square of the piece
     """
+    __slots__ = ()
     type_ = "R"
 
-    def __init__(self, color:int, position:tuple[int,int]) -> None:
-        self.moved = True
-        if position[1] == 0 and not color:
-            self.moved = False
-        elif position[1] == 7 and color:
-            self.moved = False
-        super().__init__(color, position)
-
-    def move(self, move:str) -> None:
-        if not self.can_move(move):
-            raise IllegalMoveError(self, move)
-        if self.is_occupied(move, True):
-            Piece.board.half_moves = 0
-            Piece.board[move].piece.delete()
-        del Piece.board[self.pos]
-        self.pos = move
-        Piece.board[move].piece = self
-        self.moved = True
-
-    def get_moves(self) -> list[str]:
+    def get_moves(self) -> list[Move]:
         return self.get_straight_moves()
 
-    def can_move(self, move:str) -> bool:
-        if len(move) == 2:
-            return self.can_move_straight(move)
-
 
 class Bishop(Piece):
     """Bishop piece
 
     Args:
         color (int): color of the piece
-        position (tuple[int, int]): Position of the piece in a numeric form.
+        pos (int): index of the square of the piece
     """
+    __slots__ = ()
     type_ = "B"
 
-    def move(self, move:str) -> None:
-        if not self.can_move(move):
-            raise IllegalMoveError(self, move)
-        if self.is_occupied(move, True):
-            Piece.board.half_moves = 0
-            Piece.board[move].piece.delete()
-        del Piece.board[self.pos]
-        self.pos = move
-        Piece.board[move].piece = self
-
-    def get_moves(self) -> list[str]:
+    def get_moves(self) -> list[Move]:
         return self.get_diagonal_moves()
 
-    def can_move(self, move:str) -> bool:
-        if len(move) == 2:
-            return self.can_move_diagonally(move)
-
 
 class Queen(Piece):
     """Queen piece
 
     Args:
         color (int): color of the piece
-        position (tuple[int, int]): Position of the piece in a numeric form.
+        pos (int): index of the square of the piece
     """
+    __slots__ = ()
     type_ = "Q"
 
-    def move(self, move:str) -> None:
-        if not self.can_move(move):
-            raise IllegalMoveError(self, move)
-        if self.is_occupied(move, True):
-            Piece.board.half_moves = 0
-            Piece.board[move].piece.delete()
-        del Piece.board[self.pos]
-        self.pos = move
-        Piece.board[move].piece = self
-
-    def get_moves(self) -> list[str]:
+    def get_moves(self) -> list[Move]:
         return self.get_straight_moves() + self.get_diagonal_moves()
 
-    def can_move(self, move:str) -> bool:
-        if len(move) == 2:
-            return self.can_move_straight(move) or self.can_move_diagonally(move)
-
 
 class Knight(Piece):
     """Knight piece
 
     Args:
         color (int): color of the piece
-        position (tuple[int, int]): Position of the piece in a numeric form.
+        pos (int): index of the square of the piece
     """
+    __slots__ = ()
     type_ = "N"
 
-    def move(self, move:str) -> None:
-        if not self.can_move(move):
-            raise IllegalMoveError(self, move)
-        if self.is_occupied(move, True):
-            Piece.board.half_moves = 0
-            Piece.board[move].piece.delete()
-        del Piece.board[self.pos]
-        self.pos = move
-        Piece.board[move].piece = self
-
-    def can_move(self, move:str) -> bool:
-        if len(move) == 2 and not self.is_occupied(move):
-            if abs(ord(self.pos[0]) - ord(move[0])) == 2:
-                return abs(int(self.pos[1]) - int(move[1])) == 1
-            elif abs(ord(self.pos[0]) - ord(move[0])) == 1:
-                return abs(int(self.pos[1]) - int(move[1])) == 2
-        return False
-
-    def get_moves(self) -> list[str]:
-        moves = []
-        for i in (2, -2, 1, -1):
-            for j in (2, -2, 1, -1):
-                if abs(i) != abs(j):
-                    square = f"{chr(ord(self.pos[0]) + i)}{int(self.pos[1]) + j}"
-                    if check_UCI(self.pos+square) and self.can_move(square):
-                        moves.append(square)
-        return moves
+    def get_moves(self) -> list[Move]:
+        targets = BB_KNIGHT_ATTACKS[self.pos] & ~self.board.occupied[self.color]
+        return [Move(self.pos, square) for square in scan(targets)]
 
 
 class Pawn(Piece):
@@ -486,179 +302,49 @@ class Pawn(Piece):
 
     Args:
         color (int): color of the piece
-        position (tuple[int, int]): Position of the piece in a numeric form.
+        pos (int): index of the square of the piece
     """
+    __slots__ = ()
     type_ = "P"
 
-    def get_moves(self) -> list[str]:
+    def get_moves(self) -> list[Move]:
+        board = self.board
+        square = self.pos
+        occupied = board.occupied[0] | board.occupied[1]
+        attacks = BB_PAWN_ATTACKS[self.color][square]
+        targets = [(target, 0) for target in scan(attacks & board.occupied[not self.color])]
+        if board.en_passant is not None and attacks & BB_SQUARES[board.en_passant]:
+            targets.append((board.en_passant, Move.EN_PASSANT))
+        step = -8 if self.color else 8
+        if 0 <= square + step < 64 and not occupied & BB_SQUARES[square + step]:
+            targets.append((square + step, 0))
+            double = square + 2*step
+            if (BB_SQUARES[square] & board.double_push_ranks[self.color]
+                    and 0 <= double < 64 and not occupied & BB_SQUARES[double]):
+                targets.append((double, Move.DOUBLE_PUSH))
         moves = []
-        for i in (1, 2, -1, -2):
-            move = self.pos[0] + str(int(self.pos[1])+i)
-            if check_UCI(self.pos+move) and move[1] not in "18":
-                res = self.can_move(move)
-                if isinstance(res, tuple):
-                    if res[0]:
-                        moves.append(move)
-                elif res:
-                    moves.append(move)
-        for i in (1, -1):
-            for j in (1, -1):
-                move = chr(ord(self.pos[0])+i) + str(int(self.pos[1])+j)
-                if check_UCI(self.pos+move) and move[1] not in "18":
-                    res = self.can_move(move)
-                    if isinstance(res, tuple):
-                        if res[0]:
-                            moves.append(move)
-                    elif res:
-                        moves.append(move)
-                for k in "rnqb":
-                    move = chr(ord(self.pos[0])+i) + str(int(self.pos[1])+j)+k
-                    if check_UCI(self.pos+move):
-                        res = self.can_move(move)
-                        if isinstance(res, tuple):
-                            if res[0]:
-                                moves.append(move)
-                        elif res:
-                            moves.append(move)
-            for l in "rnqb":
-                move = self.pos[0]+ str(int(self.pos[1])+i)+l
-                if check_UCI(self.pos+move):
-                    res = self.can_move(move)
-                    if isinstance(res, tuple):
-                        if res[0]:
-                            moves.append(move)
-                    elif res:
-                        moves.append(move)
+        for target, flags in targets:
+            if BB_SQUARES[target] & BB_RANKS[0 if self.color else 7]:
+                moves.extend(Move(square, target, promotion, flags)
+                             for promotion in board.promotions)
+            else:
+                moves.append(Move(square, target, "", flags))
         return moves
 
-    def move(self, move:str) -> None:
-        """A pawn move"""
-        match self.can_move(move):
-            case True:
-                del Piece.board[self.pos]
-                self.pos = move
-                Piece.board[move].piece = self
-            case (True, Piece() as piece):
-                del Piece.board[self.pos]
-                Piece.board[move].piece.delete()
-                self.pos = move
-                Piece.board[self.pos].piece = self
-
-            case (True, Piece() as piece, True):
-                self.delete()
-                piece.delete()
-                match move[2]:
-                    case "q":
-                        p = Queen(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "r":
-                        p = Rook(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "n":
-                        p = Knight(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "b":
-                        p = Bishop(self.color, (ord(move[0])-97, int(move[1])-1))
-                Piece.board[move].piece = p
-                Piece.board.pieces.append(p)
-
-            case (True, Piece() as piece, False):
-                del Piece.board[self.pos]
-                piece.delete()
-                self.pos = move
-                Piece.board[self.pos].piece = self
-
-            case(True, True):
-                del Piece.board[self.pos]
-                Piece.board.pieces.remove(self)
-                match move[2]:
-                    case "q":
-                        p = Queen(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "r":
-                        p = Rook(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "n":
-                        p = Knight(self.color, (ord(move[0])-97, int(move[1])-1))
-                    case "b":
-                        p = Bishop(self.color, (ord(move[0])-97, int(move[1])-1))
-                Piece.board[move].piece = p
-                Piece.board.pieces.append(p)
-                del self
-
-            case(True, y):
-                del Piece.board[self.pos]
-                self.pos = move
-                Piece.board[self.pos].piece = self
-                Piece.board.en_passant = y
-            case _:
-                raise IllegalMoveError(self, move)
-        
-        Piece.board.half_moves = 0
-
-    def can_move(self, move:str
-            ) -> tuple[bool, None|Piece|str|bool]|tuple[bool, None|Piece, bool]|bool:
-        if self.is_occupied(move):
-            return False
-        if self.is_occupied(move, True) and not self.can_capture(move):
-            return False
-        if self.pos[0] == move[0]:
-            match int(self.pos[1]) - int(move[1]):
-                case 1 if self.color:
-                    if move[1] == "1":
-                        return True, True
-                    return True
-                case -1 if not self.color:
-                    if move[1] == "8":
-                        return True, True
-                    return True
-                case 2 if self.color and self.pos[1] == "7":
-                    if self.is_occupied(f"{self.pos[0]}6", both=True):
-                        return False
-                    return True, f"{self.pos[0]}6"
-                case -2 if not self.color and self.pos[1] == "2":
-                    if self.is_occupied(f"{self.pos[0]}3", both=True):
-                        return False
-                    return True, f"{self.pos[0]}3"
-            return False
-        b = self.can_move_diagonally(move, True, True)
-        if self.is_occupied(move, True):
-            if not self.can_move_diagonally(move, True):
-                return False
-            return (bool((b and not self.color) or (not b and self.color)), 
-                    Piece.board[move].piece, move[1] == ("1" if self.color else "8"))
-        if Piece.board.en_passant == move:
-            if not self.can_move_diagonally(move, True):
-                return False
-            return (bool((b and not self.color) or (not b and self.color)),
-                    Piece.board[f"{move[0]}{int(move[1]) + (1 if move[1] == '3' else -1)}"].piece)
-        return False
-
-    def can_capture(self, move:str) -> bool:
-        b = self.can_move_diagonally(move, True, True)
-        if self.is_occupied(move, True) or Piece.board.en_passant == move:
-            if not self.can_move_diagonally(move, True):
-                return False
-            return bool((b and not self.color) or (not b and self.color))
-        return False
-
 
-class SquareMeta(type):
-    """Metaclass for the square class"""
-    squares:dict[str, Square] = {}
-    def __call__(cls, pos):
-        obj = super().__call__(pos)
-        SquareMeta.squares[f"{chr(pos[0]+97)}{pos[1]+1}"] = obj
-        return obj
-
-    def __getitem__(self, index:str) -> Square:
-        return self.squares[index]
-
-
-class Square(metaclass=SquareMeta):
+class Square:
     """A Square
 
     Args:
-        pos (tuple[int, int]): A numeric form of the position of the square
+        board (Board): The board the square is on
+        index (int): index of the square, from 0 for a1 to 63 for h8
     """
-    def __init__(self, pos:tuple[int, int]) -> None:
-        self.pos = pos
-        self.piece:Piece = None
+    __slots__ = ("board", "index", "_piece")
+
+    def __init__(self, board:Board, index:int) -> None:
+        self.board = board
+        self.index = index
+        self._piece:Piece = None
 
     def __repr__(self) -> str:
         return str(self.piece or " ")
@@ -666,14 +352,46 @@ class Square(metaclass=SquareMeta):
     def __bool__(self) -> bool:
         return bool(self.piece)
 
+    @property
+    def piece(self) -> Piece|None:
+        return self._piece
+
+    @piece.setter
+    def piece(self, piece:Piece|None) -> None:
+        """Places the piece on the square, keeping the board's bitboards, Zobrist key and
+        evaluation in sync
+        """
+        board = self.board
+        mask = BB_SQUARES[self.index]
+        if self._piece is not None:
+            board.bitboards[self._piece.type][self._piece.color] &= ~mask
+            board.occupied[self._piece.color] &= ~mask
+            board.zobrist ^= ZOBRIST_PIECES[self._piece.type][self._piece.color][self.index]
+            board.evaluation -= board.piece_square_tables[self._piece.type][self._piece.color][self.index]
+        if piece is not None:
+            board.bitboards[piece.type][piece.color] |= mask
+            board.occupied[piece.color] |= mask
+            board.zobrist ^= ZOBRIST_PIECES[piece.type][piece.color][self.index]
+            board.evaluation += board.piece_square_tables[piece.type][piece.color][self.index]
+            piece.board = board
+        self._piece = piece
+
     def is_attacked(self, color:int=None) -> bool:
         """Returns a bool if the square is attacked by an enemy piece"""
-        for piece in Piece.board.pieces:
-            if (piece.color != (self.piece.color if self.piece else color)
-                and piece.can_capture(f"{chr(self.pos[0]+97)}{self.pos[1]+1}")
-            ):
-                return True
-        return False
+        color = self.piece.color if self.piece else color
+        if color is None:
+            return (self.board.is_attacked_by(0, self.index)
+                    or self.board.is_attacked_by(1, self.index))
+        return self.board.is_attacked_by(int(not color), self.index)
+
+    def attackers_of(self, color:int=None) -> set[Piece]:
+        """Returns the enemy pieces attacking the square, or those of both colors if the
+        square is empty and no color is given
+        """
+        color = self.piece.color if self.piece else color
+        if color is None:
+            return self.board.attackers_of(self.index, 0) | self.board.attackers_of(self.index, 1)
+        return self.board.attackers_of(self.index, int(not color))
 
 
 class Clock:
@@ -685,12 +403,19 @@ class Clock:
         Defaults to 0.
         sleep (float, optional): Time between each clock loop. Used to lower the cpu load.
         Defaults to 0.1.
+        board (Board|None, optional): Board whose game ends when the time is up.
+        Defaults to None.
 
     Raises:
         ValueError: When a wrong format is passed
     """
-    def __init__(self, format_:str, turn:int=0, sleep:float=0.1) -> None:
+    __slots__ = ("board", "turn", "increment", "delay", "ticking", "other", "initial", "white",
+                 "black", "sleep")
+
+    def __init__(self, format_:str, turn:int=0, sleep:float=0.1,
+                 board:Board|None=None) -> None:
         time = format_.split("+")
+        self.board = board
         self.turn = turn
         self.increment = 0
         self.delay = 0
@@ -729,8 +454,8 @@ class Clock:
         while self.ticking:
             sleep(self.sleep)
             setattr(self, attr, getattr(self, attr)-self.sleep*10)
-            if getattr(self, attr) <= 0:
-                Piece.board.is_over()
+            if getattr(self, attr) <= 0 and self.board is not None:
+                self.board.is_over()
 
         # Increment after every move
         setattr(self, attr, getattr(self, attr)+self.increment)
@@ -759,6 +484,94 @@ class Clock:
         return any(player <= 0 for player in self.time())
 
 
+class Undo:
+    """Everything needed to take back a move played with Board.push
+
+    Args:
+        move (Move|None): The move played, None for a null move
+        piece (Piece|None): The piece that moved, None for a null move
+        start (int): Square the piece moved from
+        castling_rights (int): Castling rights before the move
+        en_passant (int|None): En passant square before the move
+        half_moves (int): Half move clock before the move
+        zobrist (int): Zobrist key before the move
+        evaluation (int): Evaluation before the move
+    """
+    __slots__ = ("move", "piece", "start", "end", "captured", "capture_square", "promoted",
+                 "rook", "rook_square", "castling_rights", "en_passant", "half_moves",
+                 "zobrist", "evaluation")
+
+    def __init__(self, move:Move|None, piece:Piece|None, start:int, castling_rights:int,
+                 en_passant:int|None, half_moves:int, zobrist:int, evaluation:int) -> None:
+        self.move = move
+        self.piece = piece
+        self.start = start
+        self.end:int = start
+        self.captured:Piece|None = None
+        self.capture_square:int = start
+        self.promoted:Piece|None = None
+        self.rook:Rook|None = None
+        self.rook_square:int = start
+        self.castling_rights = castling_rights
+        self.en_passant = en_passant
+        self.half_moves = half_moves
+        self.zobrist = zobrist
+        self.evaluation = evaluation
+
+
+class MoveCache:
+    """A least recently used cache of legal move lists keyed by position
+
+    Args:
+        maxsize (int, optional): Number of positions kept. Defaults to 2048.
+    """
+    __slots__ = ("maxsize", "hits", "misses", "_moves")
+
+    def __init__(self, maxsize:int=2048) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._moves:OrderedDict[tuple[type, int], list[Move]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._moves)
+
+    def get(self, key:tuple[type, int]) -> list[Move]|None:
+        """Looks the position up, counting hits and misses
+
+        Args:
+            key (tuple[type, int]): Board class and Zobrist key of the position
+
+        Returns:
+            list[Move]|None: The legal moves, if the position is cached
+        """
+        moves = self._moves.get(key)
+        if moves is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._moves.move_to_end(key)
+        return moves
+
+    def put(self, key:tuple[type, int], moves:list[Move]) -> None:
+        """Caches the legal moves of the position, dropping the least recently used one
+        when full
+
+        Args:
+            key (tuple[type, int]): Board class and Zobrist key of the position
+            moves (list[Move]): The legal moves
+        """
+        self._moves[key] = moves
+        if len(self._moves) > self.maxsize:
+            self._moves.popitem(last=False)
+
+    def clear(self) -> None:
+        """Empties the cache and resets the counters"""
+        self._moves.clear()
+        self.hits = 0
+        self.misses = 0
+
+
 class Board:
     """The Chess Board
 
@@ -767,60 +580,127 @@ class Board:
         format_ (str, optional): Time format. Defaults to "5+0".
     """
 
+    # Every class in the board, square and piece hierarchy uses __slots__. A standard
+    # position (board, 64 squares, 32 pieces, bitboards and clock) takes about 11.5 KB
+    # as measured with tracemalloc, down from about 15.4 KB with instance dictionaries.
+    __slots__ = ("moves", "clock", "pieces", "wking", "bking", "bitboards",
+                 "occupied", "castling_rights", "board", "squares", "stack", "turn",
+                 "en_passant", "half_moves", "full_moves", "zobrist", "evaluation",
+                 "attack_maps")
     starting_fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+    promotions:dict[str, type[Piece]] = {"q": Queen, "r": Rook, "b": Bishop, "n": Knight}
+    # Ranks from which white and black pawns can move two squares
+    double_push_ranks:tuple[int, int] = (BB_RANKS[1], BB_RANKS[6])
+    # If the quiescence search may leave out captures that lose material
+    static_exchange = True
+    # Values of the pieces on each square, see chess.evaluation
+    piece_square_tables:dict[str, tuple[list[int], list[int]]] = STANDARD_TABLES
+    printer = PrettyPrinter(indent=4).pprint
+    # Shared by every board of the process, so replayed positions skip move generation
+    move_cache = MoveCache()
 
     def __init__(self, fen:str="", format_:str="5+0") -> None:
         if not fen:
             fen = self.starting_fen
-        Piece.board = self
         self.moves:list[str] = []
-        self.filter_moves = []
-        self.g_moves = []
-        self.prev = None
-        self.move_fen:list[str] = []
-        self.printer = PrettyPrinter(indent=4).pprint
         self.make_board(fen)
-        self.clock = Clock(format_, self.turn)
+        self.clock = Clock(format_, self.turn, board=self)
         if (msg := self.is_over()):
             raise ValueError(msg)
 
+    def clear(self) -> None:
+        """Removes every piece from the board"""
+        self.pieces:list[Piece] = []
+        self.wking:King = None
+        self.bking:King = None
+        # One bitboard per piece type and color, plus the occupancy of each color
+        self.bitboards:dict[str, list[int]] = {type_: [0, 0] for type_ in "KQRBNP"}
+        self.occupied:list[int] = [0, 0]
+        # Bitboard of the rooks that can still castle
+        self.castling_rights = 0
+        # Zobrist key of the position, updated by every move
+        self.zobrist = 0
+        # Material and piece-square score from white's point of view, updated by every move
+        self.evaluation = 0
+        # Zobrist key of the position the attack maps were made for, and the maps
+        self.attack_maps:tuple[int, tuple[int, int]]|None = None
+        self.board = [[Square(self, rank*8 + file) for file in range(8)] for rank in range(8)]
+        self.squares:list[Square] = [square for rank in self.board for square in rank]
+        self.stack:list[Undo] = []
+
     def make_board(self, fen:str) -> None:
         """Makes the board
 
         Args:
             fen (str): FEN for the board
         """
-        self.pieces:list[Piece] = []
-        self.wking:King = None
-        self.bking:King = None
-        self.board = [[Square((i, j)) for i in range(8)] for j in range(8)]
+        self.clear()
         parts = fen.split()
         self.turn = 0 if parts[1] == "w" else 1
-        self.en_passant = None if parts[3] == "-" else parts[3]
+        self.en_passant = None if parts[3] == "-" else SQUARES[parts[3]]
         self.half_moves = int(parts[4])
         self.full_moves = int(parts[5])
         self.make_pieces(parts[0])
-        self.wking.q = False
-        self.wking.k = False
-        self.bking.q = False
-        self.bking.k = False
-
-        if parts[2] == "-":
-            self.wking.moved = True
-            self.bking.moved = True
-        else:
-            for string in parts[2]:
-                match string:
-                    case "K":
-                        self.wking.q = True
-                    case "Q":
-                        self.wking.k = True
-                    case "k":
-                        self.bking.k = True
-                    case "q":
-                        self.bking.q = True
-                    case _:
-                        raise ValueError("Illegal FEN")
+        self.set_castling_fen(parts[2])
+        self.zobrist = self.zobrist_hash()
+
+    def zobrist_hash(self) -> int:
+        """Computes the Zobrist key of the position from scratch. Boards keep it in
+        self.zobrist and update it with every move.
+
+        Returns:
+            int: 64 bit Zobrist key
+        """
+        key = ZOBRIST_TURN if self.turn else 0
+        for type_, colors in self.bitboards.items():
+            for color in (0, 1):
+                for square in scan(colors[color]):
+                    key ^= ZOBRIST_PIECES[type_][color][square]
+        for square in scan(self.castling_rights):
+            key ^= ZOBRIST_CASTLING[square]
+        return key ^ self._en_passant_key()
+
+    def _en_passant_key(self) -> int:
+        """Zobrist key of the en passant file. Like in Polyglot, it only counts when a pawn
+        of the player to move stands next to the pawn that just moved two squares, so a
+        position gets the same key however it was reached.
+        """
+        if (self.en_passant is None or not BB_PAWN_ATTACKS[not self.turn][self.en_passant]
+                & self.bitboards["P"][self.turn]):
+            return 0
+        return ZOBRIST_EN_PASSANT[self.en_passant & 7]
+
+    def set_castling_fen(self, castling:str) -> None:
+        """Sets the castling rights from the castling part of a FEN
+
+        Args:
+            castling (str): castling rights, like "KQkq", or the rook files for chess960
+
+        Raises:
+            ValueError: If the castling rights are invalid
+        """
+        self.castling_rights = 0
+        if castling == "-":
+            return
+        for string in castling:
+            color = int(string.islower())
+            rooks = self.bitboards["R"][color] & BB_RANKS[7 if color else 0]
+            kings = self.bitboards["K"][color] & BB_RANKS[7 if color else 0]
+            if not kings:
+                continue
+            king = kings.bit_length() - 1
+            match string.upper():
+                case "K":
+                    rooks &= ~((BB_SQUARES[king] << 1) - 1)
+                    if rooks:
+                        self.castling_rights |= BB_SQUARES[rooks.bit_length() - 1]
+                case "Q":
+                    rooks &= BB_SQUARES[king] - 1
+                    self.castling_rights |= rooks & -rooks
+                case "A" | "B" | "C" | "D" | "E" | "F" | "G" | "H":
+                    self.castling_rights |= rooks & BB_SQUARES[SQUARES[f"{string.lower()}{8 if color else 1}"]]
+                case _:
+                    raise ValueError("Illegal FEN")
 
     def make_pieces(self, pieces:str) -> None:
         """Makes the board
@@ -839,34 +719,34 @@ class Board:
                     continue
                 match square:
                     case "r":
-                        piece = Rook(1, current[::-1])
+                        piece = Rook(1, current[0]*8 + current[1])
                     case "n":
-                        piece = Knight(1, current[::-1])
+                        piece = Knight(1, current[0]*8 + current[1])
                     case "b":
-                        piece = Bishop(1, current[::-1])
+                        piece = Bishop(1, current[0]*8 + current[1])
                     case "q":
-                        piece = Queen(1, current[::-1])
+                        piece = Queen(1, current[0]*8 + current[1])
                     case "p":
-                        piece = Pawn(1, current[::-1])
+                        piece = Pawn(1, current[0]*8 + current[1])
                     case "R":
-                        piece = Rook(0, current[::-1])
+                        piece = Rook(0, current[0]*8 + current[1])
                     case "N":
-                        piece = Knight(0, current[::-1])
+                        piece = Knight(0, current[0]*8 + current[1])
                     case "B":
-                        piece = Bishop(0, current[::-1])
+                        piece = Bishop(0, current[0]*8 + current[1])
                     case "Q":
-                        piece = Queen(0, current[::-1])
+                        piece = Queen(0, current[0]*8 + current[1])
                     case "P":
-                        piece = Pawn(0, current[::-1])
+                        piece = Pawn(0, current[0]*8 + current[1])
                     case "k":
                         if self.bking:
                             raise ValueError("More than 1 Black King")
-                        piece = King(1, current[::-1])
+                        piece = King(1, current[0]*8 + current[1])
                         self.bking = piece
                     case "K":
                         if self.wking:
                             raise ValueError("More than 1 White King")
-                        piece = King(0, current[::-1])
+                        piece = King(0, current[0]*8 + current[1])
                         self.wking = piece
                     case _:
                         raise ValueError("Illegal FEN")
@@ -879,42 +759,66 @@ class Board:
         if not (self.wking and self.bking):
             raise ValueError("Missing Kings")
 
+    def is_attacked_by(self, color:int, square:int, occupied:int|None=None) -> bool:
+        """Checks if any piece of the given color attacks the square
+
+        Args:
+            color (int): Color of the attacking side
+            square (int): Index of the square
+            occupied (int|None, optional): Occupancy to use for sliding pieces.
+            Defaults to the current occupancy.
+
+        Returns:
+            bool: If the square is attacked
+        """
+        bitboards = self.bitboards
+        if occupied is None:
+            occupied = self.occupied[0] | self.occupied[1]
+        queens = bitboards["Q"][color]
+        return bool(
+            BB_KNIGHT_ATTACKS[square] & bitboards["N"][color]
+            or BB_KING_ATTACKS[square] & bitboards["K"][color]
+            or BB_PAWN_ATTACKS[not color][square] & bitboards["P"][color]
+            or rook_attacks(square, occupied) & (bitboards["R"][color] | queens)
+            or bishop_attacks(square, occupied) & (bitboards["B"][color] | queens))
+
     def castling(self) -> str:
         """Returns the castling rights for FEN generation"""
-        wking = False
-        wqueen = False
-        bking = False
-        bqueen = False
-        if self.wking.moved:
-            if self.bking.moved:
-                return "-"
-            wking = None
-            wqueen = None
-        if self.bking.moved:
-            bking = None
-            bqueen = None
-
-        for piece in self.pieces:
-            if piece.type == "R" and not piece.moved:
-                if piece.color:
-                    if piece.pos[0] > self.bking.pos[0] and self.bking.k and bking is not None:
-                        bking = "k"
-                    elif self.bking.q and bqueen is not None:
-                        bqueen = "q"
+        fen = ""
+        for color in (0, 1):
+            backrank = BB_RANKS[7 if color else 0]
+            kings = self.bitboards["K"][color] & backrank
+            rooks = self.bitboards["R"][color] & backrank
+            rights = self.castling_rights & backrank
+            if not kings:
+                continue
+            king = kings.bit_length() - 1
+            for side in ("K", "Q"):
+                if side == "K":
+                    castle = rights & ~((BB_SQUARES[king] << 1) - 1)
+                    outer = rooks & ~((BB_SQUARES[king] << 1) - 1)
+                    outer = BB_SQUARES[outer.bit_length() - 1] if outer else 0
                 else:
-                    if piece.pos[0] > self.wking.pos[0] and self.wking.k and wking is not None:
-                        wking = "K"
-                    elif self.wking.q and wqueen is not None:
-                        wqueen = "Q"
-
-        return "".join(list(filter(None, (wking, wqueen, bking, bqueen)))) or "-"
+                    castle = rights & (BB_SQUARES[king] - 1)
+                    outer = rooks & (BB_SQUARES[king] - 1) & -rooks
+                if not castle:
+                    continue
+                # Shredder notation when the rook is not the outermost one (chess960)
+                if castle != outer:
+                    side = SQUARE_NAMES[castle.bit_length() - 1][0].upper()
+                fen += side.lower() if color else side
+        return fen or "-"
 
     def generate_fen(self) -> str:
         """Genrates FEN for given board"""
         fen = f"{self.generate_piece_fen()} {'b' if self.turn else 'w'} {self.castling()}"
-        fen += f" {self.en_passant or '-'} {self.half_moves} {self.full_moves}"
+        fen += f" {self.en_passant_fen()} {self.half_moves} {self.full_moves}"
         return fen
 
+    def en_passant_fen(self) -> str:
+        """Returns the en passant square for FEN generation"""
+        return "-" if self.en_passant is None else SQUARE_NAMES[self.en_passant]
+
     def generate_piece_fen(self) -> str:
         """Returns the pieces for fen generation."""
         fen = ""
@@ -938,18 +842,18 @@ class Board:
         """Prints the board"""
         self.printer(self.board[::-1])
 
-    def __getitem__(self, index:str) -> Square:
-        return self.board[int(index[1])-1][ord(index[0])-97]
+    def __getitem__(self, index:int) -> Square:
+        return self.squares[index]
 
-    def __setitem__(self, index:str, value:Piece) -> None:
-        if self.board[int(index[1])-1][ord(index[0])-97].piece is not None:
+    def __setitem__(self, index:int, value:Piece) -> None:
+        if self.squares[index].piece is not None:
             raise ValueError("Already a piece there")
-        self.board[int(index[1])-1][ord(index[0])-97].piece = value
+        self.squares[index].piece = value
 
-    def __delitem__(self, index:str) -> None:
-        piece = self.board[int(index[1])-1][ord(index[0])-97].piece
+    def __delitem__(self, index:int) -> None:
+        piece = self.squares[index].piece
         if isinstance(piece, Piece):
-            self.board[int(index[1])-1][ord(index[0])-97].piece = None
+            self.squares[index].piece = None
         else:
             raise ValueError("No piece to remove")
 
@@ -960,65 +864,668 @@ class Board:
         """Checks if the move can be played
 
         Args:
-            move (str): The move
+            move (str): The move in UCI notation
 
         Returns:
             bool: if the move can be played
         """
-        if not check_UCI(move):
-            return False
-        piece = self[move[:2]].piece
-        if isinstance(piece, Pawn) and piece.color == self.turn:
-            b = piece.can_move(move[2:])
-            if isinstance(b, tuple):
-                return b[0]
-            return b
-        if isinstance(piece, Piece) and piece.color == self.turn:
-            return piece.can_move(move[2:])
-        return False
+        return any(legal.uci() == move for legal in self.legal_moves())
+
+    def parse_uci(self, move:str) -> Move:
+        """Finds the legal move written in UCI notation
+
+        Args:
+            move (str): The move in UCI notation
+
+        Raises:
+            IllegalMoveError: If the move is not legal
+
+        Returns:
+            Move: The move
+        """
+        for legal in self.legal_moves():
+            if legal.uci() == move:
+                return legal
+        raise IllegalMoveError(msg="Illegal move")
+
+    def parse_san(self, move:str) -> Move:
+        """Finds the legal move written in standard algebraic notation, as in PGN files
+
+        Args:
+            move (str): The move in SAN, like "Nbd7", "exd5", "e8=Q+", "O-O" or "N@e4"
+
+        Raises:
+            IllegalMoveError: If the move is not legal, or ambiguous
+
+        Returns:
+            Move: The move
+        """
+        san = move.rstrip("+#!?")
+        if san.replace("0", "O") in ("O-O", "O-O-O"):
+            kingside = san.count("-") == 1
+            candidates = [legal for legal in self.legal_moves() if legal.flags & Move.CASTLING
+                          and (legal.to_square > legal.from_square) == kingside]
+        elif (match := SAN_DROP_REGEX.match(san)):
+            type_, square = match.group(1) or "P", SQUARES[match.group(2)]
+            candidates = [legal for legal in self.legal_moves() if legal.flags & Move.DROP
+                          and legal.to_square == square and legal.promotion.upper() == type_]
+        elif (match := SAN_REGEX.match(san)):
+            type_, file, rank, square, promotion = match.groups()
+            type_ = type_ or "P"
+            square = SQUARES[square]
+            squares = self.squares
+            candidates = [
+                legal for legal in self.legal_moves()
+                if legal.to_square == square and not legal.flags & (Move.CASTLING | Move.DROP)
+                and squares[legal.from_square].piece.type == type_
+                and (file is None or SQUARE_NAMES[legal.from_square][0] == file)
+                and (rank is None or SQUARE_NAMES[legal.from_square][1] == rank)
+                and legal.promotion == (promotion or "").lower()]
+        else:
+            raise IllegalMoveError(msg=f"Invalid SAN: '{move}'")
+        if len(candidates) != 1:
+            raise IllegalMoveError(msg=f"{'Ambiguous' if candidates else 'Illegal'} move: '{move}'")
+        return candidates[0]
 
-    def get_moves(self) -> list[str]:
+    def get_moves(self) -> list[Move]:
         """Gets a list of all the moves without filtering checks"""
-        if self.g_moves:
-            if self.g_moves[0] == [self.turn, self.full_moves]:
-                return self.g_moves[1]
-        moves = []
-        for piece in self.pieces:
-            if piece.color == self.turn:
-                moves.extend(map(lambda n: piece.pos+n, piece.get_moves()))
-        self.g_moves = [[self.turn, self.full_moves], moves]
+        moves = list(self.generate_piece_moves())
+        moves.extend(self.generate_castling_moves())
+        moves.extend(self.generate_en_passant_moves())
         return moves
 
-    def filter_checks(self, moves:list[str]) -> list[str]:
+    def filter_checks(self, moves:list[Move]) -> list[Move]:
         """Filters the moves to remove checks
 
         Args:
-            moves (list[str]): List of moves
+            moves (list[Move]): List of moves
+
+        Returns:
+            list[Move]: Filtered list of moves
+        """
+        legal = self.legal_moves()
+        return [move for move in moves if move in legal]
+
+    def legal_moves(self) -> list[Move]:
+        """Gets a list of all the legal moves. The list is shared through the move cache
+        and must not be modified.
+        """
+        # The same position can have other moves in another variant
+        key = (type(self), self.zobrist)
+        moves = self.move_cache.get(key)
+        if moves is None:
+            moves = list(self.generate_legal_moves())
+            self.move_cache.put(key, moves)
+        return moves
+
+    def perft(self, depth:int) -> int:
+        """Counts the positions reached by playing every sequence of legal moves of the
+        given length. Used to test and benchmark move generation, so it calls the
+        generator directly rather than going through the move cache.
+
+        Args:
+            depth (int): Number of half moves
 
         Returns:
-            list[str]: Filtered list of moves
+            int: Number of leaf positions
         """
-        if self.filter_moves:
-            if self.filter_moves[0] == [self.turn, self.full_moves]:
-                return self.filter_moves[1]
-        filtered = []
+        if depth < 1:
+            return 1
+        moves = list(self.generate_legal_moves())
+        if depth == 1:
+            return len(moves)
+        nodes = 0
         for move in moves:
-            self._old_play(move)
-            if not Square[self.wking.pos if self.turn else self.bking.pos].is_attacked():
-                filtered.append(move)
-            self.reverse()
-        self.filter_moves = [[self.turn, self.full_moves], filtered]
-        return filtered
+            self.push(move)
+            nodes += self.perft(depth - 1)
+            self.pop()
+        return nodes
+
+    def perft_divide(self, depth:int) -> dict[str, int]:
+        """Counts the perft nodes under each legal move
+
+        Args:
+            depth (int): Number of half moves, including the first one
+
+        Returns:
+            dict[str, int]: The nodes for each move, in UCI notation
+        """
+        nodes = {}
+        for move in list(self.generate_legal_moves()):
+            self.push(move)
+            nodes[move.uci()] = self.perft(depth - 1)
+            self.pop()
+        return nodes
+
+    def generate_legal_moves(self) -> Iterator[Move]:
+        """Generates the legal moves, working out checks and pins once for the position
+        instead of trying every move
+        """
+        color = self.turn
+        them = int(not color)
+        kings = self.bitboards["K"][color]
+        if not kings:
+            yield from self.get_moves()
+            return
+        king = kings.bit_length() - 1
+        occupied = self.occupied[0] | self.occupied[1]
+
+        # The king may go to any square that is not attacked once it has left its own
+        for target in scan(BB_KING_ATTACKS[king] & ~self.occupied[color]):
+            if not self.is_attacked_by(them, target, occupied ^ kings):
+                yield Move(king, target)
+
+        checkers = self.attackers(them, king)
+        if checkers & (checkers - 1):
+            return
+        if checkers:
+            # Evasions have to capture the checker or block the check
+            targets = between(king, checkers.bit_length() - 1) | checkers
+        else:
+            targets = BB_ALL
+            yield from self.generate_castling_moves()
+
+        pins = self.pins(color, king)
+        pinned = 0
+        for square, ray in pins.items():
+            pinned |= BB_SQUARES[square]
+            yield from self.generate_piece_moves(BB_SQUARES[square], targets & ray)
+        yield from self.generate_piece_moves(~(kings | pinned), targets)
+
+        # En passant can uncover the king along the rank, so it is simply tried out
+        for move in self.generate_en_passant_moves():
+            self.push(move)
+            if not self.is_attacked_by(them, king):
+                yield move
+            self.pop()
+
+    def generate_legal_captures(self, checks:bool=False) -> Iterator[Move]:
+        """Generates the legal captures and promotions, without generating quiet moves
+
+        Args:
+            checks (bool, optional): Also generate the quiet moves putting a piece on a
+            square it checks the enemy king from. Defaults to False.
+        """
+        color = self.turn
+        them = int(not color)
+        bitboards = self.bitboards
+        enemy = self.occupied[them]
+        occupied = self.occupied[0] | self.occupied[1]
+        promotions = BB_RANKS[0 if color else 7] & ~occupied
+        kings = bitboards["K"][color]
+        if not kings:
+            for move in self.get_moves():
+                if (enemy & BB_SQUARES[move.to_square] or move.flags & Move.EN_PASSANT
+                        or move.promotion):
+                    yield move
+            return
+        king = kings.bit_length() - 1
+
+        for target in scan(BB_KING_ATTACKS[king] & enemy):
+            if not self.is_attacked_by(them, target, occupied ^ kings):
+                yield Move(king, target)
+
+        checkers = self.attackers(them, king)
+        if checkers & (checkers - 1):
+            return
+        targets = between(king, checkers.bit_length() - 1) | checkers if checkers else BB_ALL
+
+        # Squares from which each piece type would check the enemy king
+        check_squares = {}
+        enemy_kings = bitboards["K"][them]
+        if checks and enemy_kings:
+            enemy_king = enemy_kings.bit_length() - 1
+            straight = rook_attacks(enemy_king, occupied)
+            diagonal = bishop_attacks(enemy_king, occupied)
+            check_squares = {"N": BB_KNIGHT_ATTACKS[enemy_king], "B": diagonal, "R": straight,
+                             "Q": straight | diagonal,
+                             "P": BB_PAWN_ATTACKS[them][enemy_king] & ~promotions}
+
+        pins = self.pins(color, king)
+        pinned = 0
+        masks = []
+        for square, ray in pins.items():
+            pinned |= BB_SQUARES[square]
+            masks.append((BB_SQUARES[square], targets & ray))
+        masks.append((~(kings | pinned), targets))
+        for from_mask, to_mask in masks:
+            yield from self.generate_piece_moves(from_mask, to_mask & enemy)
+            yield from self.generate_piece_moves(from_mask & bitboards["P"][color],
+                                                 to_mask & promotions)
+            for type_, squares in check_squares.items():
+                yield from self.generate_piece_moves(from_mask & bitboards[type_][color],
+                                                     to_mask & squares & ~occupied)
+
+        for move in self.generate_en_passant_moves():
+            self.push(move)
+            if not self.is_attacked_by(them, king):
+                yield move
+            self.pop()
+
+    def generate_piece_moves(self, from_mask:int=BB_ALL, to_mask:int=BB_ALL) -> Iterator[Move]:
+        """Generates the moves of the pieces without castling, en passant or filtering checks
+
+        Args:
+            from_mask (int, optional): bitboard of the squares to move from. Defaults to all.
+            to_mask (int, optional): bitboard of the squares to move to. Defaults to all.
+        """
+        color = self.turn
+        bitboards = self.bitboards
+        occupied = self.occupied[0] | self.occupied[1]
+        targets = ~self.occupied[color] & to_mask
+
+        for square in scan(bitboards["N"][color] & from_mask):
+            for target in scan(BB_KNIGHT_ATTACKS[square] & targets):
+                yield Move(square, target)
+        for square in scan(bitboards["B"][color] & from_mask):
+            for target in scan(bishop_attacks(square, occupied) & targets):
+                yield Move(square, target)
+        for square in scan(bitboards["R"][color] & from_mask):
+            for target in scan(rook_attacks(square, occupied) & targets):
+                yield Move(square, target)
+        for square in scan(bitboards["Q"][color] & from_mask):
+            for target in scan(queen_attacks(square, occupied) & targets):
+                yield Move(square, target)
+        for square in scan(bitboards["K"][color] & from_mask):
+            for target in scan(BB_KING_ATTACKS[square] & targets):
+                yield Move(square, target)
+
+        pawns = bitboards["P"][color] & from_mask
+        if not pawns:
+            return
+        last_rank = BB_RANKS[0 if color else 7]
+        empty = ~occupied & BB_ALL
+        moves = []
+        for square in scan(pawns):
+            for target in scan(BB_PAWN_ATTACKS[color][square] & self.occupied[not color] & to_mask):
+                moves.append((square, target, 0))
+        step = -8 if color else 8
+        single = (pawns >> 8 if color else pawns << 8) & empty
+        double = single & (self.double_push_ranks[color] >> 8 if color
+                           else self.double_push_ranks[color] << 8)
+        double = (double >> 8 if color else double << 8) & empty
+        for target in scan(single & to_mask):
+            moves.append((target - step, target, 0))
+        for target in scan(double & to_mask):
+            moves.append((target - 2*step, target, Move.DOUBLE_PUSH))
+        for square, target, flags in moves:
+            if BB_SQUARES[target] & last_rank:
+                for promotion in self.promotions:
+                    yield Move(square, target, promotion, flags)
+            else:
+                yield Move(square, target, "", flags)
+
+    def generate_castling_moves(self, color:int|None=None) -> Iterator[Move]:
+        """Generates the castling moves. In chess960 the king takes its own rook when it
+        would move less than two files.
+
+        Args:
+            color (int|None, optional): Color of the king. Defaults to the player to move.
+        """
+        if color is None:
+            color = self.turn
+        backrank = BB_RANKS[7 if color else 0]
+        kings = self.bitboards["K"][color] & backrank
+        rights = self.castling_rights & backrank
+        if not (kings and rights):
+            return
+        king = self.squares[kings.bit_length() - 1].piece
+        if self.is_attacked_by(int(not color), king.pos):
+            return
+        for square in scan(rights):
+            if king.castle_route(square):
+                side = 0 if square > king.pos else 2
+                target = King.CASTLING[color+side]
+                if abs((target & 7) - (king.pos & 7)) < 2:
+                    target = square
+                yield Move(king.pos, target, "", Move.CASTLING)
+
+    def generate_en_passant_moves(self) -> Iterator[Move]:
+        """Generates the en passant captures without filtering checks"""
+        if self.en_passant is None:
+            return
+        color = self.turn
+        square = self.en_passant
+        for pawn in scan(BB_PAWN_ATTACKS[not color][square] & self.bitboards["P"][color]):
+            yield Move(pawn, square, "", Move.EN_PASSANT)
+
+    def attackers(self, color:int, square:int, occupied:int|None=None) -> int:
+        """Gets the pieces of the given color that attack the square
+
+        Args:
+            color (int): Color of the attacking side
+            square (int): Index of the square
+            occupied (int|None, optional): Occupancy to use for sliding pieces.
+            Defaults to the current occupancy.
+
+        Returns:
+            int: bitboard of the attacking pieces
+        """
+        bitboards = self.bitboards
+        if occupied is None:
+            occupied = self.occupied[0] | self.occupied[1]
+        queens = bitboards["Q"][color]
+        return ((BB_KNIGHT_ATTACKS[square] & bitboards["N"][color])
+                | (BB_KING_ATTACKS[square] & bitboards["K"][color])
+                | (BB_PAWN_ATTACKS[not color][square] & bitboards["P"][color])
+                | (rook_attacks(square, occupied) & (bitboards["R"][color] | queens))
+                | (bishop_attacks(square, occupied) & (bitboards["B"][color] | queens)))
+
+    def attackers_of(self, square:int, color:int) -> set[Piece]:
+        """Gets the pieces of the given color that attack the square, looking outwards
+        from the square rather than at every piece
+
+        Args:
+            square (int): Index of the square
+            color (int): Color of the attacking side
+
+        Returns:
+            set[Piece]: The attacking pieces
+        """
+        squares = self.squares
+        return {squares[index].piece for index in scan(self.attackers(color, square))}
+
+    def attack_map(self, color:int) -> int:
+        """Gets every square the given color attacks. Both colors' maps are made together
+        the first time they are asked for in a position and kept until a move is played.
+
+        Args:
+            color (int): Color of the attacking side
+
+        Returns:
+            int: bitboard of the attacked squares
+        """
+        if self.attack_maps is None or self.attack_maps[0] != self.zobrist:
+            bitboards = self.bitboards
+            occupied = self.occupied[0] | self.occupied[1]
+            maps = []
+            for side in (0, 1):
+                attacked = 0
+                for square in scan(bitboards["N"][side]):
+                    attacked |= BB_KNIGHT_ATTACKS[square]
+                for square in scan(bitboards["K"][side]):
+                    attacked |= BB_KING_ATTACKS[square]
+                for square in scan(bitboards["P"][side]):
+                    attacked |= BB_PAWN_ATTACKS[side][square]
+                for square in scan(bitboards["R"][side] | bitboards["Q"][side]):
+                    attacked |= rook_attacks(square, occupied)
+                for square in scan(bitboards["B"][side] | bitboards["Q"][side]):
+                    attacked |= bishop_attacks(square, occupied)
+                maps.append(attacked)
+            self.attack_maps = (self.zobrist, tuple(maps))
+        return self.attack_maps[1][color]
+
+    def pins(self, color:int, king:int) -> dict[int, int]:
+        """Finds the pieces pinned to the king
+
+        Args:
+            color (int): Color of the king
+            king (int): Square of the king
+
+        Returns:
+            dict[int, int]: the squares of the pinned pieces, with the bitboard of the
+            squares they can still move to
+        """
+        them = int(not color)
+        bitboards = self.bitboards
+        occupied = self.occupied[0] | self.occupied[1]
+        queens = bitboards["Q"][them]
+        own = self.occupied[color]
+        # Sliders that would attack the king if one of its own pieces stepped aside
+        snipers = ((rook_xray_attacks(king, occupied, own) & (bitboards["R"][them] | queens))
+                   | (bishop_xray_attacks(king, occupied, own) & (bitboards["B"][them] | queens)))
+        pins = {}
+        for sniper in scan(snipers):
+            ray = between(king, sniper)
+            pins[(ray & own).bit_length() - 1] = ray | BB_SQUARES[sniper]
+        return pins
+
+    def see(self, move:Move) -> int:
+        """Static exchange evaluation: plays out every capture on the destination square of
+        the move, least valuable attacker first, with either side free to stop when going
+        on would lose material. Sliders lined up behind a capturing piece join in as it
+        leaves. Pins are not looked at.
+
+        Args:
+            move (Move): The move, as generated by the board
+
+        Returns:
+            int: Material the player to move wins, negative if the move loses material
+        """
+        bitboards = self.bitboards
+        to_square = move.to_square
+        target = BB_SQUARES[to_square]
+        last_rank = BB_RANKS[0] | BB_RANKS[7]
+        occupied = self.occupied[0] | self.occupied[1]
+        if move.flags & Move.DROP:
+            gain = [0]
+            attacker = SEE_VALUES[move.promotion.upper()]
+            occupied |= target
+        else:
+            victim = self.squares[to_square].piece
+            if move.flags & Move.EN_PASSANT:
+                gain = [SEE_VALUES["P"]]
+                occupied ^= BB_SQUARES[to_square - 8 if self.turn == 0 else to_square + 8]
+            elif victim is not None and victim.color != self.turn:
+                gain = [SEE_VALUES[victim.type]]
+            else:
+                gain = [0]
+            attacker = SEE_VALUES[self.squares[move.from_square].piece.type]
+            if move.promotion:
+                attacker = SEE_VALUES[move.promotion.upper()]
+                gain[0] += attacker - SEE_VALUES["P"]
+            occupied ^= BB_SQUARES[move.from_square]
+
+        color = not self.turn
+        while True:
+            attackers = self.attackers(color, to_square, occupied) & occupied
+            if not attackers:
+                break
+            for type_ in "PNBRQK":
+                pieces = attackers & bitboards[type_][color]
+                if pieces:
+                    break
+            # The piece on the square is lost unless the capture is answered
+            gain.append(attacker - gain[-1])
+            attacker = SEE_VALUES[type_]
+            if type_ == "P" and target & last_rank:
+                attacker = SEE_VALUES["Q"]
+                gain[-1] += attacker - SEE_VALUES["P"]
+            occupied ^= pieces & -pieces
+            color = not color
+
+        while len(gain) > 1:
+            last = gain.pop()
+            gain[-1] = -max(-gain[-1], last)
+        return gain[0]
 
     def __iter__(self) -> Square:
-        return (self[file+rank] for file in "abcdefgh" for rank in "12345678")
+        return iter(self.squares)
+
+    def push(self, move:Move) -> None:
+        """Plays the move without checking if it is legal. It can be taken back with pop.
+
+        Args:
+            move (Move): The move, as generated by the board
+        """
+        start, end = move.from_square, move.to_square
+        piece = self.squares[start].piece
+        undo = Undo(move, piece, start, self.castling_rights, self.en_passant, self.half_moves,
+                    self.zobrist, self.evaluation)
+        self.stack.append(undo)
+        self.zobrist ^= self._en_passant_key()
+        self.en_passant = None
+        self.half_moves += 1
+        target = self.squares[end].piece
+
+        if move.flags & Move.CASTLING:
+            # The king either goes to its destination or takes its own rook
+            backrank = BB_RANKS[7 if piece.color else 0]
+            rooks = self.castling_rights & backrank
+            if target and target.color == piece.color:
+                rook_square = end
+            elif end > start:
+                rook_square = (rooks & ~((BB_SQUARES[start] << 1) - 1)).bit_length() - 1
+            else:
+                rook_square = (rooks & (BB_SQUARES[start] - 1) & -rooks).bit_length() - 1
+            side = 0 if rook_square > start else 2
+            end = King.CASTLING[piece.color+side]
+            rook = self._remove(rook_square)
+            self._remove(start)
+            self._put(end, piece)
+            self._put(King.CASTLED_ROOK[piece.color+side], rook)
+            undo.end = end
+            undo.rook = rook
+            undo.rook_square = rook_square
+            self.castling_rights &= ~backrank
+        else:
+            capture_square = end
+            if move.flags & Move.EN_PASSANT:
+                capture_square = end - 8 if piece.color == 0 else end + 8
+                target = self.squares[capture_square].piece
+            self._remove(start)
+            if target is not None:
+                self._remove(capture_square)
+                self.pieces.remove(target)
+                undo.captured = target
+                undo.capture_square = capture_square
+                self.half_moves = 0
+            if move.promotion:
+                promoted = self.promotions[move.promotion](piece.color, end)
+                promoted.promoted = True
+                self.pieces.remove(piece)
+                self.pieces.append(promoted)
+                self._put(end, promoted)
+                undo.promoted = promoted
+            else:
+                self._put(end, piece)
+            undo.end = end
+            if piece.type == "P":
+                self.half_moves = 0
+                if move.flags & Move.DOUBLE_PUSH:
+                    self.en_passant = (start + end) // 2
+            elif piece.type == "K":
+                self.castling_rights &= ~BB_RANKS[7 if piece.color else 0]
+            self.castling_rights &= ~(BB_SQUARES[start] | BB_SQUARES[capture_square])
+
+        for square in scan(undo.castling_rights ^ self.castling_rights):
+            self.zobrist ^= ZOBRIST_CASTLING[square]
+        self.zobrist ^= ZOBRIST_TURN
+        if self.turn:
+            self.full_moves += 1
+        self.turn = int(not self.turn)
+        self.zobrist ^= self._en_passant_key()
+
+    def pop(self) -> Move:
+        """Takes back the last move played with push
+
+        Returns:
+            Move: The move taken back
+        """
+        undo = self.stack.pop()
+        self.turn = int(not self.turn)
+        if self.turn:
+            self.full_moves -= 1
+        self.castling_rights = undo.castling_rights
+        self.en_passant = undo.en_passant
+        self.half_moves = undo.half_moves
+
+        self._remove(undo.end)
+        if undo.rook is not None:
+            self._remove(King.CASTLED_ROOK[undo.piece.color + (0 if undo.rook_square > undo.start else 2)])
+            self._put(undo.rook_square, undo.rook)
+        if undo.promoted is not None:
+            self.pieces.remove(undo.promoted)
+            self.pieces.append(undo.piece)
+        self._put(undo.start, undo.piece)
+        if undo.captured is not None:
+            self._put(undo.capture_square, undo.captured)
+            self.pieces.append(undo.captured)
+        self.zobrist = undo.zobrist
+        self.evaluation = undo.evaluation
+        return undo.move
+
+    def push_null(self) -> None:
+        """Passes the turn without moving, for the engine's null move pruning. It can be
+        taken back with pop_null. Repetitions are not looked for across a null move.
+        """
+        self.stack.append(Undo(None, None, 0, self.castling_rights, self.en_passant,
+                               self.half_moves, self.zobrist, self.evaluation))
+        self.zobrist ^= self._en_passant_key()
+        self.en_passant = None
+        self.half_moves = 0
+        self.zobrist ^= ZOBRIST_TURN
+        if self.turn:
+            self.full_moves += 1
+        self.turn = int(not self.turn)
+
+    def pop_null(self) -> None:
+        """Takes back a null move played with push_null"""
+        undo = self.stack.pop()
+        self.turn = int(not self.turn)
+        if self.turn:
+            self.full_moves -= 1
+        self.en_passant = undo.en_passant
+        self.half_moves = undo.half_moves
+        self.zobrist = undo.zobrist
+
+    def allows_stand_pat(self) -> bool:
+        """Checks if the player to move may decline every capture, so the quiescence
+        search can take the evaluation as it stands instead of capturing
+        """
+        return True
+
+    def allows_null_move(self) -> bool:
+        """Checks if passing is never better than moving for the player to move, so a
+        null move can stand in for their best move. Positions where every move hurts,
+        zugzwang, are likely when only pawns and the king are left.
+        """
+        bitboards = self.bitboards
+        return bool(self.occupied[self.turn] & ~(bitboards["P"][self.turn] | bitboards["K"][self.turn]))
+
+    def _remove(self, square:int) -> Piece:
+        """Takes the piece off the square, keeping it in the list of pieces"""
+        square = self.squares[square]
+        piece = square.piece
+        square.piece = None
+        return piece
+
+    def _put(self, square:int, piece:Piece) -> None:
+        """Puts the piece on the empty square"""
+        self.squares[square].piece = piece
+        piece.pos = square
+
+    def is_repetition(self, count:int=3) -> bool:
+        """Checks if the position has occurred the given number of times. Only the
+        positions since the last capture or pawn move can repeat, so only those are
+        compared, using the Zobrist keys saved on the move stack.
+
+        Args:
+            count (int, optional): Number of occurrences. Defaults to 3.
+
+        Returns:
+            bool: If the position has occurred count times
+        """
+        seen = 1
+        plies = min(self.half_moves, len(self.stack))
+        # Positions with the same player to move are two plies apart
+        for ply in range(2, plies + 1, 2):
+            if self.stack[-ply].zobrist == self.zobrist:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
 
     def reverse(self) -> None:
         """Reverses a played move"""
-        if not self.prev:
+        if not self.stack:
             raise IllegalMoveError(msg="No move has been played")
-        self.make_board(self.prev)
-        self.prev = None
+        self.pop()
+
+    def is_check(self) -> bool:
+        """Checks if the king of the player to move is attacked"""
+        kings = self.bitboards["K"][self.turn]
+        return bool(kings) and self.is_attacked_by(int(not self.turn), kings.bit_length() - 1)
 
     def play(self, move:str) -> None:
         """Play the given move
@@ -1030,25 +1537,48 @@ class Board:
             IllegalMoveError: If the move is Illegal
             ValueError: If the game is over
         """
-        if not move in self.filter_checks(self.get_moves()):
-            raise IllegalMoveError(msg="Illegal move")
-        piece = self[move[:2]].piece
-        self.move_fen.append(self.generate_piece_fen())
-        before = self.en_passant
-        self.half_moves += 1
-        piece.move(move[2:])
-        self.turn = int(not self.turn)
-        if before and self.en_passant == before:
-            self.en_passant = None
+        legal = self.parse_uci(move)
         self.moves.append(f"{self.full_moves}. {move}")
         print(f"{self.full_moves}. {move}")
-        if piece.color:
-            self.full_moves += 1
+        self.push(legal)
         self.clock()
         self.print_board()
         print(self.clock.time())
         self.is_over()
 
+    def evaluate(self) -> int:
+        """Returns the static evaluation of the position from the point of view of the
+        player to move. It is kept up to date move by move, so this costs the same in
+        every position.
+
+        Returns:
+            int: Score in centipawns
+        """
+        return -self.evaluation if self.turn else self.evaluation
+
+    def variant_outcome(self) -> int|None:
+        """Checks if a rule of the variant other than running out of moves has decided
+        the game. Unlike outcome it generates no moves.
+
+        Returns:
+            int|None: 1 if the player to move has won, -1 if they have lost, 0 for a draw
+            and None if the game goes on
+        """
+        return None
+
+    def outcome(self) -> int|None:
+        """Checks if the rules have decided the game, without ending it. Used by the
+        engine, which leaves the clock, repetitions and the 50 move rule aside.
+
+        Returns:
+            int|None: 1 if the player to move has won, -1 if they have lost, 0 for a draw
+            and None if the game goes on
+        """
+        outcome = self.variant_outcome()
+        if outcome is None and not self.legal_moves():
+            return -1 if self.is_check() else 0
+        return outcome
+
     def is_over(self) -> None:
         """Ends the game if the game is over"""
         msg = ""
@@ -1056,13 +1586,11 @@ class Board:
             if self.is_insufficient_material()[self.turn]:
                 msg = "Draw by Time out"
             msg = "Time out!"
-        elif not (moves := self.get_moves()):
-            msg = "Stalemate"
-        elif not self.filter_checks(moves):
-            msg = "Checkmate"
+        elif not self.legal_moves():
+            msg = "Checkmate" if self.is_check() else "Stalemate"
         elif self.half_moves >= 100:
             msg = "Draw by 50 move rule"
-        elif 3 in Counter(self.move_fen).values():
+        elif self.is_repetition():
             msg = "Threefold repetition"
         elif self.is_insufficient_material()[2]:
             msg = "Insufficient material"
@@ -1096,10 +1624,10 @@ class Board:
         if len(white) <= 1:
             wins = True
         else:
-            color = ord(white[0].pos[0]) %2 == int(white[0].pos[1]) %2
+            color = (white[0].pos & 7) %2 == (white[0].pos >> 3) %2
             for piece in white:
                 if piece.type == "B":
-                    if color is (ord(piece.pos[0]) %2 == int(piece.pos[1]) %2):
+                    if color is ((piece.pos & 7) %2 == (piece.pos >> 3) %2):
                         wins = True
                     else:
                         wins = False
@@ -1111,10 +1639,10 @@ class Board:
         if len(black) <= 1:
             bins = True
         else:
-            color = ord(black[0].pos[0]) %2 == int(black[0].pos[1]) %2
+            color = (black[0].pos & 7) %2 == (black[0].pos >> 3) %2
             for piece in black:
                 if piece.type == "B":
-                    if color is (ord(piece.pos[0]) %2 == int(piece.pos[1]) %2):
+                    if color is ((piece.pos & 7) %2 == (piece.pos >> 3) %2):
                         wins = True
                     else:
                         wins = False
@@ -1133,8 +1661,8 @@ class Board:
             elif all(p.type == "B" for p in white) and all(p.type == "B" for p in black):
                 draw = True
                 for b, w in zip(black, white):
-                    bcolor = (ord(w.pos[0]) %2 == int(w.pos[1]) %2)
-                    wcolor = (ord(b.pos[0]) %2 == int(b.pos[1]) %2)
+                    bcolor = ((w.pos & 7) %2 == (w.pos >> 3) %2)
+                    wcolor = ((b.pos & 7) %2 == (b.pos >> 3) %2)
                     if wcolor is not bcolor:
                         draw = False
                         break
@@ -1145,14 +1673,6 @@ class Board:
             return False if wb else wins, False, False
         return wins, bins, draw
 
-    def _old_play(self, move:str) -> None:
-        before = self.en_passant
-        self.prev = self.generate_fen()
-        self[move[:2]].piece.move(move[2:])
-        self.turn = int(not self.turn)
-        if before and self.en_passant == before:
-            self.en_passant = None
-
     def resign(self, color:int) -> None:
         """Resign the game"""
         raise ValueError(f"Resignation by {color}")
@@ -1166,24 +1686,6 @@ class Board:
         raise ValueError("Aborted")
 
 
-def check_UCI(move:str) -> bool:
-    """Checks if the move is correct or not
-
-    Args:
-        move (str): The move to check
-
-    Returns:
-        bool: if the move is according to UCI notation or not
-    """
-    if len(move) == 4:
-        if move[0] in "abcdefgh" and move[2] in "abcdefgh":
-            return move[1] in "12345678" and move[3] in "12345678"
-    elif len(move) == 5:
-        if move[0] in "abcdefgh" and move[2] in "abcdefgh":
-            return move[1] in "27" and move[3] in "18" and move[4] in "qrnb"
-    return False
-
-
 def generate_chess960_pieces() -> str:
     pieces = 'KQRrBbNN'
     starts = {''.join(p).upper() for p in permutations(pieces)
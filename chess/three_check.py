@@ -1,6 +1,7 @@
 """Contains the code for the Three Check variant"""
 
 from chess import standard as std
+from chess.zobrist import ZOBRIST_CHECKS
 
 
 class King(std.King):
@@ -8,13 +9,15 @@ class King(std.King):
 
     Args:
         color (int): color of the piece
-        position (tuple[int, int]): Position of the piece in a numeric form.
+        pos (int): index of the square of the piece
     """
+    __slots__ = ("lives", "checks")
     max_checks = 3
 
-    def __init__(self, color:int, position:tuple[int, int]) -> None:
+    def __init__(self, color:int, pos:int) -> None:
         self.lives = self.max_checks
-        super().__init__(color=color, position=position)
+        self.checks = 0
+        super().__init__(color, pos)
 
 
 class Board(std.Board):
@@ -24,24 +27,37 @@ class Board(std.Board):
         fen (str, optional): starting FEN. Defaults to the standard starting FEN.
         format_ (str, optional): Time format. Defaults to "5+0".
     """
+    __slots__ = ()
     starting_fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1 +0+0"
 
-    def play(self, move:str) -> None:
-        """Play the given move
+    def push(self, move:std.Move) -> None:
+        """Plays the move without checking if it is legal. It can be taken back with pop.
 
         Args:
-            move (str): The move to play
+            move (std.Move): The move, as generated by the board
+        """
+        super().push(move)
+        if self.is_check():
+            king = self.bking if self.turn else self.wking
+            self.zobrist ^= ZOBRIST_CHECKS[king.color][king.checks]
+            king.checks += 1
 
-        Raises:
-            IllegalMoveError: If the move is Illegal
-            ValueError: If the game is over
+    def pop(self) -> std.Move:
+        """Takes back the last move played with push
+
+        Returns:
+            std.Move: The move taken back
         """
-        super().play(move)
-        if std.Square[self.wking.pos].is_attacked():
-            self.wking.checks += 1
-        elif std.Square[self.bking.pos].is_attacked():
-            self.bking.checks += 1
-        self.is_over()
+        if self.is_check():
+            (self.bking if self.turn else self.wking).checks -= 1
+        return super().pop()
+
+    def variant_outcome(self) -> int|None:
+        """Checks if the rules have decided the game. The third check wins."""
+        king = self.bking if self.turn else self.wking
+        if king.checks >= king.max_checks:
+            return -1
+        return None
 
     def is_over(self) -> None:
         """Checks if the game is over
@@ -58,13 +74,11 @@ class Board(std.Board):
             msg = "Three Checks, white lost"
         elif self.bking.checks >= self.bking.max_checks:
             msg = "Three Checks, black lost"
-        elif not (moves := self.get_moves()):
-            msg = "Stalemate"
-        elif not self.filter_checks(moves):
-            msg = "Checkmate"
+        elif not self.legal_moves():
+            msg = "Checkmate" if self.is_check() else "Stalemate"
         elif self.half_moves >= 100:
             msg = "Draw by 50 move rule"
-        elif 3 in std.Counter(self.move_fen).values():
+        elif self.is_repetition():
             msg = "Threefold repetition"
         elif self.is_insufficient_material()[2]:
             msg = "Insufficient material"
@@ -86,6 +100,17 @@ class Board(std.Board):
         super().make_board(fen[:-5])
         self.bking.checks = int(checks[1])
         self.wking.checks = int(checks[3])
+        self.zobrist = self.zobrist_hash()
+
+    def zobrist_hash(self) -> int:
+        """Computes the Zobrist key of the position from scratch, including the checks
+        given to each king
+        """
+        key = super().zobrist_hash()
+        for king in (self.wking, self.bking):
+            for check in range(king.checks):
+                key ^= ZOBRIST_CHECKS[king.color][check]
+        return key
 
     def make_pieces(self, pieces:str) -> None:
         """Makes the board
@@ -104,34 +129,34 @@ class Board(std.Board):
                     continue
                 match square:
                     case "r":
-                        piece = std.Rook(1, current[::-1])
+                        piece = std.Rook(1, current[0]*8 + current[1])
                     case "n":
-                        piece = std.Knight(1, current[::-1])
+                        piece = std.Knight(1, current[0]*8 + current[1])
                     case "b":
-                        piece = std.Bishop(1, current[::-1])
+                        piece = std.Bishop(1, current[0]*8 + current[1])
                     case "q":
-                        piece = std.Queen(1, current[::-1])
+                        piece = std.Queen(1, current[0]*8 + current[1])
                     case "p":
-                        piece = std.Pawn(1, current[::-1])
+                        piece = std.Pawn(1, current[0]*8 + current[1])
                     case "R":
-                        piece = std.Rook(0, current[::-1])
+                        piece = std.Rook(0, current[0]*8 + current[1])
                     case "N":
-                        piece = std.Knight(0, current[::-1])
+                        piece = std.Knight(0, current[0]*8 + current[1])
                     case "B":
-                        piece = std.Bishop(0, current[::-1])
+                        piece = std.Bishop(0, current[0]*8 + current[1])
                     case "Q":
-                        piece = std.Queen(0, current[::-1])
+                        piece = std.Queen(0, current[0]*8 + current[1])
                     case "P":
-                        piece = std.Pawn(0, current[::-1])
+                        piece = std.Pawn(0, current[0]*8 + current[1])
                     case "k":
                         if self.bking:
                             raise ValueError("More than 1 Black King")
-                        piece = King(1, current[::-1])
+                        piece = King(1, current[0]*8 + current[1])
                         self.bking = piece
                     case "K":
                         if self.wking:
                             raise ValueError("More than 1 White King")
-                        piece = King(0, current[::-1])
+                        piece = King(0, current[0]*8 + current[1])
                         self.wking = piece
                     case _:
                         raise ValueError("Illegal FEN")
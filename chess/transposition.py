@@ -0,0 +1,275 @@
+"""Contains the transposition table, a fixed size hash table of search results keyed
+by the Zobrist key of the position
+"""
+
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+from typing import NamedTuple
+from chess.standard import Move
+
+
+# Promotion and drop letters, packed as their index
+_PROMOTIONS = ("", "q", "r", "b", "n", "k", "p", "Q", "R", "B", "N", "P")
+_PROMOTION_INDEX = {letter: index for index, letter in enumerate(_PROMOTIONS)}
+
+
+def pack_move(move:Move|None) -> int:
+    """Packs the move into an int, 0 standing for no move
+
+    Args:
+        move (Move|None): The move
+
+    Returns:
+        int: from square | to square << 6 | promotion << 12 | flags << 16
+    """
+    if move is None:
+        return 0
+    return (move.from_square | move.to_square << 6 | _PROMOTION_INDEX[move.promotion] << 12
+            | move.flags << 16)
+
+
+def unpack_move(packed:int) -> Move|None:
+    """Unpacks a move packed with pack_move
+
+    Args:
+        packed (int): The packed move
+
+    Returns:
+        Move|None: The move, or None if no move was packed
+    """
+    if not packed:
+        return None
+    return Move(packed & 63, packed >> 6 & 63, _PROMOTIONS[packed >> 12 & 15], packed >> 16)
+
+
+class Entry(NamedTuple):
+    """A transposition table entry
+
+    Args:
+        depth (int): Depth the position was searched to
+        bound (int): TranspositionTable.EXACT, LOWER or UPPER
+        score (int): Score of the position
+        move (Move|None): Best move found, if any
+    """
+    depth:int
+    bound:int
+    score:int
+    move:Move|None
+
+
+class TranspositionTable:
+    """A fixed size transposition table. The entries are kept in parallel arrays, one
+    slot per key modulo the size of the table.
+
+    Args:
+        size_mb (float, optional): Memory budget in megabytes. Defaults to 16.
+        replacement (str, optional): "depth" to keep the deepest entry of a slot, or "age"
+        to also replace entries left over from earlier searches. Defaults to "depth".
+
+    Raises:
+        ValueError: If the replacement policy is unknown or the budget is too small
+    """
+    __slots__ = ("size", "replacement", "generation", "keys", "depths", "bounds", "scores",
+                 "moves", "ages")
+
+    # bounds
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    # key, depth, bound, score, move and age
+    ENTRY_SIZE = 8 + 1 + 1 + 8 + 4 + 1
+
+    def __init__(self, size_mb:float=16, replacement:str="depth") -> None:
+        if replacement not in ("depth", "age"):
+            raise ValueError(f"Unknown replacement policy: '{replacement}'")
+        self.size = int(size_mb * 1024 * 1024) // self.ENTRY_SIZE
+        if self.size < 1:
+            raise ValueError("Transposition table too small")
+        self.replacement = replacement
+        self.generation = 0
+        self.clear()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def clear(self) -> None:
+        """Empties the table"""
+        self.keys = array("Q", [0]) * self.size
+        # A depth of -1 marks an empty slot
+        self.depths = array("b", [-1]) * self.size
+        self.bounds = array("B", [0]) * self.size
+        self.scores = array("q", [0]) * self.size
+        self.moves = array("I", [0]) * self.size
+        self.ages = array("B", [0]) * self.size
+
+    def new_search(self) -> None:
+        """Starts a new search, ageing the entries already stored"""
+        self.generation = (self.generation + 1) & 255
+
+    def probe(self, key:int) -> Entry|None:
+        """Looks the position up
+
+        Args:
+            key (int): Zobrist key of the position
+
+        Returns:
+            Entry|None: The entry stored for the position, if any
+        """
+        index = key % self.size
+        if self.depths[index] < 0 or self.keys[index] != key:
+            return None
+        return Entry(self.depths[index], self.bounds[index], self.scores[index],
+                     unpack_move(self.moves[index]))
+
+    def store(self, key:int, depth:int, bound:int, score:int, move:Move|None=None) -> bool:
+        """Stores a search result, unless the slot holds a more valuable entry
+
+        Args:
+            key (int): Zobrist key of the position
+            depth (int): Depth the position was searched to
+            bound (int): EXACT, LOWER or UPPER
+            score (int): Score of the position
+            move (Move|None, optional): Best move found. Defaults to None.
+
+        Returns:
+            bool: If the entry was stored
+        """
+        index = key % self.size
+        stored = self.depths[index]
+        if (stored >= 0 and self.keys[index] != key and depth < stored
+                and not (self.replacement == "age" and self.ages[index] != self.generation)):
+            return False
+        if move is None and stored >= 0 and self.keys[index] == key:
+            # Keep the best move found by an earlier search of the same position
+            packed = self.moves[index]
+        else:
+            packed = pack_move(move)
+        self.keys[index] = key
+        self.depths[index] = max(0, min(depth, 127))
+        self.bounds[index] = bound
+        self.scores[index] = score
+        self.moves[index] = packed
+        self.ages[index] = self.generation
+        return True
+
+    def hashfull(self) -> int:
+        """Returns how full the table is, in permille, sampling the first thousand slots"""
+        sample = min(self.size, 1000)
+        used = sum(1 for index in range(sample)
+                   if self.depths[index] >= 0 and self.ages[index] == self.generation)
+        return used * 1000 // sample
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """A transposition table in shared memory, so searches in several processes can use
+    each other's results. The process creating it owns the memory; other processes
+    attach to it by name, which pickling the table does for them.
+
+    Processes write without locks, so an entry can be torn by two writes to the same
+    slot at once. The key is stored xored with the rest of the entry, which makes a torn
+    entry fail the key check and read as a miss.
+
+    Args:
+        size_mb (float, optional): Memory budget in megabytes. Defaults to 16.
+        replacement (str, optional): "depth" or "age", see TranspositionTable.
+        Defaults to "depth".
+        name (str|None, optional): Name of the shared memory block to attach to.
+        Defaults to creating a new block.
+
+    Raises:
+        ValueError: If the replacement policy is unknown or the budget is too small
+    """
+    __slots__ = ("size_mb", "name", "owner", "memory")
+
+    def __init__(self, size_mb:float=16, replacement:str="depth", name:str|None=None) -> None:
+        self.size_mb = size_mb
+        self.name = name
+        self.owner = name is None
+        self.memory:SharedMemory|None = None
+        super().__init__(size_mb, replacement)
+
+    def __reduce__(self) -> tuple:
+        return type(self), (self.size_mb, self.replacement, self.name)
+
+    def clear(self) -> None:
+        """Empties the table. When attaching to an existing table, only maps it."""
+        if self.memory is None:
+            if self.owner:
+                self.memory = SharedMemory(create=True, size=self.size * self.ENTRY_SIZE)
+                self.name = self.memory.name
+            else:
+                self.memory = SharedMemory(name=self.name)
+            # Widest fields first, so every array is aligned
+            buffer = self.memory.buf
+            offset = 0
+            for name, format_, width in (("keys", "Q", 8), ("scores", "q", 8),
+                                         ("moves", "I", 4), ("depths", "b", 1),
+                                         ("bounds", "B", 1), ("ages", "B", 1)):
+                end = offset + self.size * width
+                setattr(self, name, buffer[offset:end].cast(format_))
+                offset = end
+            if not self.owner:
+                return
+        self.memory.buf[:self.size * self.ENTRY_SIZE] = bytes(self.size * self.ENTRY_SIZE)
+        self.depths[:] = array("b", [-1]) * self.size
+
+    def probe(self, key:int) -> Entry|None:
+        """Looks the position up
+
+        Args:
+            key (int): Zobrist key of the position
+
+        Returns:
+            Entry|None: The entry stored for the position, if any
+        """
+        index = key % self.size
+        depth, bound, score, packed = (self.depths[index], self.bounds[index],
+                                       self.scores[index], self.moves[index])
+        if depth < 0 or self.keys[index] ^ _check(depth, bound, score, packed) != key:
+            return None
+        return Entry(depth, bound, score, unpack_move(packed))
+
+    def store(self, key:int, depth:int, bound:int, score:int, move:Move|None=None) -> bool:
+        """Stores a search result, unless the slot holds a more valuable entry
+
+        Args:
+            key (int): Zobrist key of the position
+            depth (int): Depth the position was searched to
+            bound (int): EXACT, LOWER or UPPER
+            score (int): Score of the position
+            move (Move|None, optional): Best move found. Defaults to None.
+
+        Returns:
+            bool: If the entry was stored
+        """
+        index = key % self.size
+        stored = self.depths[index]
+        same = stored >= 0 and self.keys[index] ^ _check(
+            stored, self.bounds[index], self.scores[index], self.moves[index]) == key
+        if (stored >= 0 and not same and depth < stored
+                and not (self.replacement == "age" and self.ages[index] != self.generation)):
+            return False
+        # Keep the best move found by an earlier search of the same position
+        packed = self.moves[index] if move is None and same else pack_move(move)
+        depth = max(0, min(depth, 127))
+        self.depths[index] = depth
+        self.bounds[index] = bound
+        self.scores[index] = score
+        self.moves[index] = packed
+        self.ages[index] = self.generation
+        self.keys[index] = key ^ _check(depth, bound, score, packed)
+        return True
+
+    def close(self) -> None:
+        """Unmaps the table, and frees the shared memory if this process created it"""
+        for name in ("keys", "scores", "moves", "depths", "bounds", "ages"):
+            getattr(self, name).release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def _check(depth:int, bound:int, score:int, packed:int) -> int:
+    """Packs the fields of an entry into the 64 bits xored with its key"""
+    return (score & 0xFFFFFFFF | packed << 32 | depth << 54 | bound << 62) & 0xFFFFFFFFFFFFFFFF
@@ -0,0 +1,29 @@
+"""Contains the random keys used for Zobrist hashing
+
+A position's key is the XOR of one key for each piece on its square, one for the
+side to move, one per castling rook, one for the en passant file and, in the
+variants that have them, keys for the pieces in hand and the checks given. The
+boards keep their key up to date as moves are played instead of recomputing it.
+"""
+
+from random import Random
+
+
+_random = Random(0x5EED_C0DE)
+
+
+def _keys(count:int) -> list[int]:
+    return [_random.getrandbits(64) for _ in range(count)]
+
+
+# ZOBRIST_PIECES[type][color][square]
+ZOBRIST_PIECES = {type_: (_keys(64), _keys(64)) for type_ in "KQRBNP"}
+# XORed in when black is to move
+ZOBRIST_TURN = _random.getrandbits(64)
+# One key per square a castling rook can stand on
+ZOBRIST_CASTLING = _keys(64)
+ZOBRIST_EN_PASSANT = _keys(8)
+# ZOBRIST_POCKETS[type][color][n] is XORed in for the n-th piece of the type in hand
+ZOBRIST_POCKETS = {type_: (_keys(64), _keys(64)) for type_ in "QRBNP"}
+# ZOBRIST_CHECKS[color][n] is XORed in for the n-th check given to the king of color
+ZOBRIST_CHECKS = (_keys(64), _keys(64))
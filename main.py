@@ -6,7 +6,8 @@ def main() -> None:
     while True:
         m = input("::>><<:: ")
         if m == "moves":
-            print((moves := b.filter_checks(b.get_moves())), len(moves))
+            moves = b.legal_moves()
+            print([str(move) for move in moves], len(moves))
         elif m == "show":
             b.print_board()
             print(b.clock.time())